@@ -0,0 +1,43 @@
+"""
+Silhouette microbenchmarks, run from the repository root with ``python -m benchmarks.<name>``.
+
+"""
+from __future__ import print_function
+
+import os
+import timeit
+
+
+def setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    import django
+    if hasattr(django, 'setup'):
+        django.setup()
+
+
+def measure(func, number=10000, repeat=5):
+    """
+    Best time per call of func over repeat runs, in microseconds.
+
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def autorange(func, min_time=0.2, repeat=3):
+    """
+    Best time per call of func, in microseconds, calling it enough times for each run to last at least min_time seconds.
+
+    """
+    number = 1
+    while True:
+        elapsed = timeit.timeit(func, number=number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / elapsed)) if elapsed else number * 10
+    return min([elapsed] + timeit.repeat(func, number=number, repeat=repeat - 1)) / number * 1e6
+
+
+def report(title, results, unit="us"):
+    print(title)
+    for name, value in results:
+        print("    {:<40} {:>10.2f} {}".format(name, value, unit))
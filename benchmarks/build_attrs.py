@@ -0,0 +1,45 @@
+"""
+Per-call cost of BaseSilhouette.build_attrs, before and after precompiling the prefix splitter.
+
+"""
+from __future__ import print_function
+
+import re
+from django.utils import six
+
+from . import setup, measure, report
+
+
+def legacy_build_attrs(attrs, *prefixes):
+    if not prefixes:
+        return {'attrs': attrs}
+    split_attrs = {'attrs': {}}
+    for key, value in six.iteritems(attrs):
+        match = re.match("^({})_".format("|".join(re.escape(p) for p in prefixes)), key)
+        if match:
+            parent_key, nested_key = "{}_attrs".format(key[:match.end() - 1]), key[match.end():]
+            if parent_key not in split_attrs:
+                split_attrs[parent_key] = {}
+            split_attrs[parent_key][nested_key] = value
+        else:
+            split_attrs['attrs'][key] = value
+    return split_attrs
+
+
+def main():
+    setup()
+    from silhouette.templatetags.silhouette_tags import BaseSilhouette
+
+    tag = BaseSilhouette.__new__(BaseSilhouette)
+    prefixes = ('label', 'widget', 'errors', 'help_text')
+    attrs = {'class': 'field', 'widget_class': 'form-control', 'widget_placeholder': 'Email', 'label_class': 'control-label',
+             'help_text_class': 'help-block', 'errors_class': 'alert alert-danger'}
+    assert legacy_build_attrs(attrs, *prefixes) == tag.build_attrs(attrs, *prefixes)
+    report("build_attrs ({} attributes, {} prefixes)".format(len(attrs), len(prefixes)), [
+        ("before", measure(lambda: legacy_build_attrs(attrs, *prefixes))),
+        ("after", measure(lambda: tag.build_attrs(attrs, *prefixes))),
+    ])
+
+
+if __name__ == "__main__":
+    main()
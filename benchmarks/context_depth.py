@@ -0,0 +1,75 @@
+"""
+Cost of resolving variables from the templates of deeply nested tags, before and after rendering each tag with a
+single flattened context frame. Pages are simulated by nesting the formset tag in {% with %} blocks, and variables
+are resolved from the context of the innermost tag (field_errors, rendered by formset > formset_form > form_fields >
+field). Run with ``python -m benchmarks.context_depth [depth ...]`` (0, 10 and 50 outer blocks by default).
+
+"""
+from __future__ import print_function
+
+import sys
+
+from . import setup, measure, report
+
+
+def legacy_enter(self):
+    scope = {self.PATH_CONTEXT_KEY: self.path_override, self.THEME_CONTEXT_KEY: self.theme_override}
+    scope.update(self.get_extra_context())
+    self.context.update(scope)
+    return self.context
+
+
+def legacy_exit(self, *args, **kwargs):
+    self.context.pop()
+
+
+def main(depths):
+    setup()
+    from django.forms.formsets import formset_factory
+    from django.template import Context, Variable
+    from silhouette.templatetags.silhouette_tags import BaseSilhouette, FieldErrors
+    from tests.mock.forms import MockForm2
+    try:
+        from django.template.loader import get_template_from_string
+    except ImportError:
+        from django.template import engines
+        get_template_from_string = engines['django'].from_string
+
+    flat = (BaseSilhouette.__enter__, BaseSilhouette.__exit__)
+    legacy = (legacy_enter, legacy_exit)
+    render_errors = FieldErrors.render
+    stacks = []
+
+    def capture(self, context):
+        stacks.append(list(context.dicts))
+        return render_errors(self, context)
+
+    formset = formset_factory(MockForm2, extra=10)()
+    page_variable, tag_variable = Variable("page_title"), Variable("field")
+    lookups = [("page variable", lambda context: page_variable.resolve(context)),
+               ("missing variable", lambda context: context.get("missing")),
+               ("tag variable", lambda context: tag_variable.resolve(context))]
+    for depth in depths:
+        source = "{% load silhouette_tags %}" + "{% with level=1 %}" * depth + "{% formset formset %}" + \
+                 "{% endwith %}" * depth
+        template = get_template_from_string(source)
+        render = lambda: template.render(Context({"formset": formset, "page_title": "Formset"}))
+        results = []
+        for name, (enter, exit) in (("before", legacy), ("after", flat)):
+            BaseSilhouette.__enter__, BaseSilhouette.__exit__ = enter, exit
+            del stacks[:]
+            FieldErrors.render = capture
+            render()
+            FieldErrors.render = render_errors
+            context = Context()
+            context.dicts = stacks[-1]
+            results.append(("{} (render, ms)".format(name), measure(render, number=1, repeat=5) / 1000))
+            results.append(("{} (inherited frames)".format(name), len(context.dicts)))
+            for label, lookup in lookups:
+                results.append(("{} ({}, us)".format(name, label), measure(lambda: lookup(context))))
+        BaseSilhouette.__enter__, BaseSilhouette.__exit__ = flat
+        report("formset of {} forms nested in {} blocks".format(len(formset.forms), depth), results, unit="")
+
+
+if __name__ == "__main__":
+    main([int(depth) for depth in sys.argv[1:]] or [0, 10, 50])
@@ -0,0 +1,45 @@
+"""
+Time to render a form with Silhouette tags from Django templates and from Jinja2 templates, with the Django and the
+Jinja2 base themes. Run with ``python -m benchmarks.jinja_tags`` (requires Jinja2).
+
+"""
+from __future__ import print_function
+
+from . import setup, measure, report
+
+DJANGO_ENGINE = {
+    "BACKEND": "django.template.backends.django.DjangoTemplates",
+    "APP_DIRS": True,
+}
+
+JINJA2_ENGINE = {
+    "BACKEND": "django.template.backends.jinja2.Jinja2",
+    "APP_DIRS": True,
+    "OPTIONS": {"environment": "silhouette.jinja.environment"},
+}
+
+
+def main():
+    setup()
+    from django.template import Context, engines
+    from django.test.utils import override_settings
+    from silhouette.jinja import environment
+    from tests.mock.forms import MockForm
+
+    form = MockForm()
+    django_page = "{% load silhouette_tags %}{% silhouette form action='/' %}"
+    jinja_page = "{{ silhouette(form, action='/') }}"
+    results = []
+    with override_settings(TEMPLATES=[DJANGO_ENGINE]):
+        template = engines['django'].from_string(django_page).template
+        results.append(("django page, django theme", measure(lambda: template.render(Context({"form": form})), number=100)))
+        template = environment().from_string(jinja_page)
+        results.append(("jinja2 page, django theme", measure(lambda: template.render(form=form), number=100)))
+    with override_settings(TEMPLATES=[JINJA2_ENGINE, DJANGO_ENGINE]):
+        template = engines['jinja2'].env.from_string(jinja_page)
+        results.append(("jinja2 page, jinja2 theme", measure(lambda: template.render(form=form), number=100)))
+    report("form with {} fields".format(len(form.fields)), results)
+
+
+if __name__ == "__main__":
+    main()
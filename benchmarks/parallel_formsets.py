@@ -0,0 +1,41 @@
+"""
+Wall-clock time of rendering large formsets with the formset tag, sequentially and with forms rendered on the
+thread pool. Run with ``python -m benchmarks.parallel_formsets [rows ...]`` (1000 and 10000 rows by default).
+
+Rendering is pure Python, so threads only overlap where the GIL is released: expect gains to depend on the
+interpreter, on I/O done while rendering (e.g. cache lookups) and on the number of cores.
+
+"""
+from __future__ import print_function
+
+import multiprocessing
+import sys
+
+from . import setup, measure, report
+
+
+def main(sizes):
+    setup()
+    from django.forms.formsets import formset_factory
+    from django.template import Context
+    from django.test.utils import override_settings
+    from tests.mock.forms import MockForm2
+    try:
+        from django.template.loader import get_template_from_string
+    except ImportError:
+        from django.template import engines
+        get_template_from_string = engines['django'].from_string
+
+    template = get_template_from_string("{% load silhouette_tags %}{% formset formset %}")
+    workers = multiprocessing.cpu_count()
+    for size in sizes:
+        formset = formset_factory(MockForm2, extra=size)()
+        render = lambda: template.render(Context({"formset": formset}))
+        results = [("sequential", measure(render, number=1, repeat=3) / 1000)]
+        with override_settings(SILHOUETTE_PARALLEL_THRESHOLD=size, SILHOUETTE_PARALLEL_WORKERS=workers):
+            results.append(("parallel ({} workers)".format(workers), measure(render, number=1, repeat=3) / 1000))
+        report("formset with {} forms".format(size), results, unit="ms")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [1000, 10000])
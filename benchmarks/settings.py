@@ -0,0 +1,20 @@
+"""
+Settings of the throughput harness: the test settings, serving the pages of benchmarks.urls.
+
+"""
+from tests.settings import *  # noqa
+
+ROOT_URLCONF = 'benchmarks.urls'
+
+ALLOWED_HOSTS = ['*']
+
+DEBUG = False
+
+TEMPLATE_CONTEXT_PROCESSORS = [
+    'django.template.context_processors.request',
+]
+
+MIDDLEWARE_CLASSES = [
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+]
@@ -0,0 +1,182 @@
+"""
+Microbenchmarks of every Silhouette tag and of the helpers they rely on, across synthetic forms of 5, 50 and 500
+fields and formsets of 10 to 10000 forms.
+
+Run with ``python -m benchmarks.suite``. Results are compared with the baseline stored in ``benchmarks/baseline.json``
+for the running Python and Django versions, and cases slower than the baseline by more than the tolerance are
+reported as regressions (the exit status is then 1). Options:
+
+    --save            store the results as the new baseline
+    --quick           skip the largest forms and formsets
+    --tolerance=0.25  relative slowdown reported as a regression
+    --filter=field    only run cases whose name contains the given text
+
+"""
+from __future__ import print_function
+
+import json
+import os
+import platform
+import sys
+
+from . import setup, autorange
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+FIELD_COUNTS = (5, 50, 500)
+
+FORMSET_SIZES = (10, 100, 1000, 10000)
+
+QUICK_FIELD_COUNTS = (5, 50)
+
+QUICK_FORMSET_SIZES = (10, 100)
+
+
+def make_form_class(field_count):
+    """
+    Form class with field_count fields, cycling through common field types
+    """
+    from django import forms
+    field_types = (
+        lambda: forms.CharField(help_text="Help text"),
+        lambda: forms.EmailField(),
+        lambda: forms.IntegerField(),
+        lambda: forms.BooleanField(),
+        lambda: forms.ChoiceField(choices=(("a", "A"), ("b", "B"))),
+        lambda: forms.CharField(widget=forms.Textarea),
+        lambda: forms.DateField(),
+        lambda: forms.CharField(widget=forms.HiddenInput),
+    )
+    attrs = {"field_{}".format(i): field_types[i % len(field_types)]() for i in range(field_count)}
+    return type(str("Form{}".format(field_count)), (forms.Form,), attrs)
+
+
+def tag_case(source, context):
+    from django.template import Context
+    try:
+        from django.template.loader import get_template_from_string
+    except ImportError:
+        from django.template import engines
+        get_template_from_string = engines['django'].from_string
+    template = get_template_from_string("{% load silhouette_tags %}" + source)
+    return lambda: template.render(Context(context))
+
+
+def get_cases(field_counts, formset_sizes):
+    """
+    Benchmarked callables by case name
+    """
+    from django.forms.formsets import formset_factory
+    from silhouette.loaders import DefaultLoader
+    from silhouette.templatetags import silhouette_filters
+    from silhouette.templatetags.silhouette_filters import to_html_attrs
+    from silhouette.templatetags.silhouette_tags import BaseSilhouette
+    from silhouette.utils import normalize
+
+    cases = {}
+    attrs = {"class": "form-control", "placeholder": "Email", "data-toggle": "tooltip", "id": "email", "required": "required"}
+    prefixed = dict(attrs, widget_class="input", label_class="label", help_text_class="help", errors_class="errors")
+    cases["merge_attrs"] = lambda: BaseSilhouette.merge_attrs(attrs, {"class": "extra form-control"}, {"id": "other"})
+    cases["build_attrs"] = lambda: BaseSilhouette.build_attrs(prefixed, "label", "widget", "errors", "help_text")
+    cases["normalize"] = lambda: normalize("SplitDateTimeWidget")
+    cases["to_html_attrs"] = lambda: to_html_attrs(attrs)
+
+    for field_count in field_counts:
+        form_class = make_form_class(field_count)
+        form = form_class()
+        bound = form_class({})
+        loader = DefaultLoader()
+        cases["loader.get_template/{}".format(field_count)] = \
+            lambda loader=loader, bound_field=form["field_0"]: loader.get_template(bound_field, "field")
+        cases["silhouette/{}".format(field_count)] = tag_case("{% silhouette form %}", {"form": form})
+        cases["silhouette_bound/{}".format(field_count)] = tag_case("{% silhouette form %}", {"form": bound})
+        cases["form_fields/{}".format(field_count)] = tag_case("{% form_fields form %}", {"form": form})
+        cases["form_errors/{}".format(field_count)] = tag_case("{% form_errors form %}", {"form": bound})
+        cases["form_controls/{}".format(field_count)] = tag_case("{% form_controls form %}", {"form": form})
+        cases["form_media/{}".format(field_count)] = tag_case("{% form_media form %}", {"form": form})
+
+    form_class = make_form_class(5)
+    form = form_class({})
+    field_source = "{{% {} form.field_0 class='extra' %}}"
+    for tag in ("field", "field_widget", "field_label", "field_help_text", "field_errors"):
+        cases[tag] = tag_case(field_source.format(tag), {"form": form})
+
+    bound_field = make_form_class(8)()["field_5"]
+    cases["filters.widget_kind"] = lambda: silhouette_filters.widget_kind(bound_field)
+    cases["filters.is_chain"] = lambda: (silhouette_filters.is_checkbox_input(bound_field) or
+                                         silhouette_filters.is_file_input(bound_field) or
+                                         silhouette_filters.is_select(bound_field) or
+                                         silhouette_filters.is_radio_select(bound_field) or
+                                         silhouette_filters.is_textarea(bound_field))
+    filter_context = {"field": bound_field, "widget_kind": silhouette_filters.widget_kind(bound_field)}
+    cases["filters.is_chain_template"] = tag_case(
+        "{% load silhouette_filters %}{% if field|is_checkbox_input %}c{% elif field|is_file_input %}f"
+        "{% elif field|is_select %}s{% elif field|is_radio_select %}r{% elif field|is_textarea %}t{% endif %}", filter_context)
+    cases["filters.widget_kind_template"] = tag_case(
+        "{% if widget_kind == 'checkbox_input' %}c{% elif widget_kind == 'file_input' %}f"
+        "{% elif widget_kind == 'select' %}s{% elif widget_kind == 'radio_select' %}r{% elif widget_kind == 'textarea' %}t{% endif %}",
+        filter_context)
+
+    for size in formset_sizes:
+        formset = formset_factory(form_class, extra=size, max_num=size)()
+        formset.forms
+        cases["formset/{}".format(size)] = tag_case("{% formset formset %}", {"formset": formset})
+        cases["formset_errors/{}".format(size)] = tag_case("{% formset_errors formset %}", {"formset": formset})
+    return cases
+
+
+def get_environment():
+    import django
+    return "python {} / django {}".format(platform.python_version(), django.get_version())
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE):
+        return {}
+    with open(BASELINE) as fp:
+        return json.load(fp)
+
+
+def save_baseline(baseline):
+    with open(BASELINE, "w") as fp:
+        json.dump(baseline, fp, indent=2, sort_keys=True)
+        fp.write("\n")
+
+
+def main(argv):
+    options = dict(arg.lstrip("-").partition("=")[::2] for arg in argv)
+    setup()
+    quick = "quick" in options
+    cases = get_cases(QUICK_FIELD_COUNTS if quick else FIELD_COUNTS, QUICK_FORMSET_SIZES if quick else FORMSET_SIZES)
+    tolerance = float(options.get("tolerance") or 0.25)
+    environment = get_environment()
+    baseline = load_baseline()
+    previous = baseline.get(environment, {})
+    results = {}
+    regressions = []
+    print(environment)
+    for name in sorted(cases):
+        if options.get("filter") and options["filter"] not in name:
+            continue
+        results[name] = autorange(cases[name])
+        line = "    {:<40} {:>14.2f} us".format(name, results[name])
+        if name in previous:
+            change = results[name] / previous[name] - 1
+            line += " {:>+8.1%}".format(change)
+            if change > tolerance:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+        sys.stdout.flush()
+    if "save" in options:
+        baseline[environment] = dict(previous, **results)
+        save_baseline(baseline)
+        print("Saved baseline to {}".format(BASELINE))
+    if regressions:
+        print("{} regression(s) above {:.0%}: {}".format(len(regressions), tolerance, ", ".join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
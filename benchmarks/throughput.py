@@ -0,0 +1,117 @@
+"""
+Throughput of pages rendered with Silhouette's bundled themes and with Django's default form rendering, served through
+Django's test client (and therefore its request handler and middleware) from several threads or processes.
+
+Run with ``python -m benchmarks.throughput [--workers=4] [--requests=200] [--mode=threads,processes]``. For each mode
+and page, reports requests per second, p50 and p99 latency, and the peak resident memory of each worker process.
+
+"""
+from __future__ import division, print_function
+
+import os
+import sys
+import threading
+import time
+from multiprocessing import Pool
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+PAGES = ('/plain/', '/silhouette/')
+
+
+def setup():
+    os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+    import django
+    if hasattr(django, 'setup'):
+        django.setup()
+
+
+def maxrss():
+    """
+    Peak resident memory of the current process, in megabytes
+    """
+    if resource is None:
+        return float('nan')
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / (1024 * 1024) if sys.platform == 'darwin' else usage / 1024
+
+
+def run_client(path, requests):
+    """
+    Request path requests times with a test client, and return the latency of each request in seconds
+    """
+    from django.test import Client
+    client = Client()
+    client.get(path)  # warm up templates and caches
+    latencies = []
+    for _ in range(requests):
+        start = time.time()
+        response = client.get(path)
+        latencies.append(time.time() - start)
+        assert response.status_code == 200, response.status_code
+    return latencies
+
+
+def run_process(args):
+    setup()
+    path, requests = args
+    return run_client(path, requests), maxrss()
+
+
+def run_threads(path, workers, requests):
+    setup()
+    results = []
+    lock = threading.Lock()
+
+    def target():
+        latencies = run_client(path, requests)
+        with lock:
+            results.extend(latencies)
+    threads = [threading.Thread(target=target) for _ in range(workers)]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.time() - start, [maxrss()]
+
+
+def run_processes(path, workers, requests):
+    pool = Pool(workers)
+    try:
+        start = time.time()
+        results = pool.map(run_process, [(path, requests)] * workers)
+        elapsed = time.time() - start
+    finally:
+        pool.close()
+        pool.join()
+    return [latency for latencies, _ in results for latency in latencies], elapsed, [rss for _, rss in results]
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))]
+
+
+def main(argv):
+    options = dict(arg.lstrip("-").partition("=")[::2] for arg in argv)
+    workers = int(options.get("workers") or 4)
+    requests = int(options.get("requests") or 200)
+    modes = (options.get("mode") or "threads,processes").split(",")
+    runners = {"threads": run_threads, "processes": run_processes}
+    print("{} workers, {} requests per worker".format(workers, requests))
+    print("    {:<10} {:<14} {:>10} {:>10} {:>10} {:>14}".format("mode", "page", "req/s", "p50 ms", "p99 ms", "max rss MB"))
+    for mode in modes:
+        for path in PAGES:
+            latencies, elapsed, rss = runners[mode](path, workers, requests)
+            print("    {:<10} {:<14} {:>10.1f} {:>10.2f} {:>10.2f} {:>14}".format(
+                mode, path, len(latencies) / elapsed, percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000,
+                "/".join("{:.0f}".format(value) for value in rss)))
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,11 @@
+try:
+    from django.conf.urls import url
+except ImportError:  # pragma: no cover
+    from django.conf.urls.defaults import url
+
+from . import views
+
+urlpatterns = [
+    url(r'^silhouette/$', views.page, {'template': views.SILHOUETTE_PAGE}),
+    url(r'^plain/$', views.page, {'template': views.PLAIN_PAGE}),
+]
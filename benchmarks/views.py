@@ -0,0 +1,35 @@
+"""
+Pages rendered by the throughput harness: a form of 20 fields and a formset of 20 forms, rendered with Silhouette's
+bundled themes or with Django's default form rendering.
+
+"""
+from django.forms.formsets import formset_factory
+from django.http import HttpResponse
+from django.template import RequestContext
+try:
+    from django.template.loader import get_template_from_string
+except ImportError:
+    from django.template import engines
+    get_template_from_string = engines['django'].from_string
+
+from .suite import make_form_class
+
+FormClass = make_form_class(20)
+
+FormSetClass = formset_factory(make_form_class(5), extra=20)
+
+SILHOUETTE_PAGE = """{% load silhouette_tags %}<html><body>{% silhouette form action="/" %}
+<form method="post">{% csrf_token %}{% formset formset %}</form></body></html>"""
+
+PLAIN_PAGE = """<html><body><form action="/">{% csrf_token %}{{ form }}<button type="submit">Submit</button></form>
+<form method="post">{% csrf_token %}{{ formset }}</form></body></html>"""
+
+templates = {}
+
+
+def page(request, template):
+    if template not in templates:
+        compiled = get_template_from_string(template)
+        templates[template] = getattr(compiled, 'template', compiled)
+    context = RequestContext(request, {'form': FormClass(), 'formset': FormSetClass()})
+    return HttpResponse(templates[template].render(context))
@@ -1,3 +1,30 @@
 __version__ = '0.0.2'
 
 default_app_config = 'silhouette.apps.Silhouette'
+
+
+def stream_formset(formset, request=None, context=None, **kwargs):
+    """
+    Render formset chunk by chunk. See silhouette.streaming.stream_formset
+
+    """
+    from .streaming import stream_formset
+    return stream_formset(formset, request=request, context=context, **kwargs)
+
+
+def render_formset_window(formset, window_start, window_size, request=None, context=None, **kwargs):
+    """
+    Render a window of the forms of formset. See silhouette.formsets.render_formset_window
+
+    """
+    from .formsets import render_formset_window
+    return render_formset_window(formset, window_start, window_size, request=request, context=context, **kwargs)
+
+
+def render_formset_empty_form(formset, request=None, context=None, **kwargs):
+    """
+    Render the empty form of formset. See silhouette.formsets.render_formset_empty_form
+
+    """
+    from .formsets import render_formset_empty_form
+    return render_formset_empty_form(formset, request=request, context=context, **kwargs)
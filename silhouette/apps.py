@@ -11,4 +11,14 @@ from pods.apps import AppSettings
 class Silhouette(AppSettings, AppConfig):
     name = "silhouette"
     settings_module = "silhouette.settings"
-    settings_imports = ('LOADER',)
+    settings_imports = ('LOADER', 'COMPILE_FORMS')
+
+    def ready(self):
+        from . import conf
+        from .loaders import loader
+        settings = conf.reload()
+        if settings.MANIFEST:
+            loader.load_manifest(settings.MANIFEST)
+        if settings.STATS:
+            from . import stats
+            stats.enable()
@@ -0,0 +1,152 @@
+"""
+Immutable snapshot of Silhouette settings, validated once and rebuilt whenever Django settings change, so that hot
+paths read settings as plain attributes::
+
+    from silhouette import conf
+    conf.settings.THEME
+
+Import strings (e.g. LOADER) are kept as is; use Silhouette.LOADER to import them.
+
+"""
+import importlib
+from string import Formatter
+from django.conf import settings as django_settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import six
+try:
+    from django.core.signals import setting_changed
+except ImportError:  # pragma: no cover
+    from django.test.signals import setting_changed
+
+from pods.apps import AppSettingsHolder
+
+from .apps import Silhouette
+
+#: Names substituted in patterns
+SUBSTITUTES = ('path', 'theme', 'form', 'formset', 'field', 'widget')
+
+#: Settings that must be positive integers or 0
+INTEGER_SETTINGS = ('ATTRS_CACHE_SIZE', 'FRAGMENT_CACHE_TIMEOUT', 'PARALLEL_WORKERS', 'PROFILE_SLOWEST')
+
+
+def compile_pattern(pattern):
+    """
+    Parse pattern into a callable formatting it with a mapping of substitutes, raising ImproperlyConfigured when it
+    uses names other than SUBSTITUTES. Patterns are parsed once, into templates for the % operator; patterns with
+    format specs or conversions are formatted with str.format.
+
+    """
+    try:
+        parsed = list(Formatter().parse(pattern))
+    except ValueError as e:
+        raise ImproperlyConfigured("Invalid Silhouette pattern '{}': {}".format(pattern, e))
+    fields = [(name, spec, conversion) for literal, name, spec, conversion in parsed if name is not None]
+    unknown = [name for name, spec, conversion in fields if name not in SUBSTITUTES]
+    if unknown:
+        raise ImproperlyConfigured("Silhouette pattern '{}' uses unknown substitutions: {}".format(pattern, ", ".join(unknown)))
+    if not fields:
+        return lambda substitutes: pattern
+    if any(spec or conversion for name, spec, conversion in fields):
+        return lambda substitutes: pattern.format(**substitutes)
+    template = "".join(literal.replace("%", "%%") + ("" if name is None else "%(" + name + ")s")
+                       for literal, name, spec, conversion in parsed)
+    return lambda substitutes: template % substitutes
+
+
+def compile_patterns(patterns):
+    """
+    Compile patterns of one template type, leaving compiled patterns as is.
+
+    """
+    return tuple(pattern if callable(pattern) else compile_pattern(pattern) for pattern in patterns)
+
+
+class Settings(object):
+    """
+    Read-only Silhouette settings. PATTERNS maps template types to tuples of compiled patterns.
+
+    """
+
+    def __init__(self, values):
+        for name, value in six.iteritems(values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Silhouette settings are read-only, override the SILHOUETTE_{} setting instead".format(name))
+
+    def __delattr__(self, name):
+        raise AttributeError("Silhouette settings are read-only")
+
+
+def validate(values):
+    if not values['PATH'] or not isinstance(values['PATH'], six.string_types):
+        raise ImproperlyConfigured("SILHOUETTE_PATH must be a non-empty string")
+    if not values['THEME'] or not isinstance(values['THEME'], six.string_types):
+        raise ImproperlyConfigured("SILHOUETTE_THEME must be a non-empty string")
+    for name in INTEGER_SETTINGS:
+        if not isinstance(values[name], six.integer_types) or values[name] < 0:
+            raise ImproperlyConfigured("SILHOUETTE_{} must be a positive integer or 0".format(name))
+    if values['CACHE_SIZE'] is not None and (not isinstance(values['CACHE_SIZE'], six.integer_types) or
+                                             values['CACHE_SIZE'] < 0):
+        raise ImproperlyConfigured("SILHOUETTE_CACHE_SIZE must be None or a positive integer or 0")
+    threshold = values['PARALLEL_THRESHOLD']
+    if threshold is not None and (not isinstance(threshold, six.integer_types) or threshold < 1):
+        raise ImproperlyConfigured("SILHOUETTE_PARALLEL_THRESHOLD must be None or a positive integer")
+    if not isinstance(values['PATTERNS'], dict):
+        raise ImproperlyConfigured("SILHOUETTE_PATTERNS must be a dict of template types to patterns")
+    for template_type, patterns in six.iteritems(values['PATTERNS']):
+        if isinstance(patterns, six.string_types) or not isinstance(patterns, (list, tuple)):
+            raise ImproperlyConfigured("SILHOUETTE_PATTERNS['{}'] must be a list or tuple of patterns".format(template_type))
+
+
+def get_setting(name, defaults):
+    """
+    Read a Silhouette setting from Django settings like django-pods does: from the SILHOUETTE dict, then from
+    SILHOUETTE_<name>, then from defaults.
+
+    """
+    user_settings = getattr(django_settings, Silhouette.settings_key, None) or {}
+    try:
+        return user_settings[name]
+    except (KeyError, TypeError):
+        return getattr(django_settings, "{}_{}".format(Silhouette.settings_key, name), defaults[name])
+
+
+def build():
+    """
+    Read and validate Silhouette settings, returning a new snapshot.
+
+    """
+    module = importlib.import_module(Silhouette.settings_module)
+    defaults = {name: getattr(module, name) for name in dir(module) if name.isupper()}
+    values = {name: get_setting(name, defaults) for name in defaults}
+    validate(values)
+    values['PATTERNS'] = {template_type: compile_patterns(patterns)
+                          for template_type, patterns in six.iteritems(values['PATTERNS'])}
+    return Settings(values)
+
+
+def clear_app_settings():
+    """
+    Replace the settings holder of django-pods, which caches settings once read, so that Silhouette.<SETTING> reads
+    overridden settings too.
+
+    """
+    Silhouette.settings = AppSettingsHolder(Silhouette.settings_module, Silhouette.settings_key,
+                                            Silhouette.settings_imports)
+
+
+def reload():
+    global settings
+    clear_app_settings()
+    settings = build()
+    return settings
+
+
+def setting_changed_receiver(setting, **kwargs):
+    if setting.startswith('SILHOUETTE'):
+        reload()
+
+setting_changed.connect(setting_changed_receiver)
+
+settings = build()
@@ -0,0 +1,31 @@
+from __future__ import unicode_literals
+
+from django.template.context import Context, RequestContext
+from django.utils.safestring import mark_safe
+
+from .streaming import bind_template
+from .templatetags.silhouette_tags import Formset, FormsetEmptyForm
+
+
+def render_formset_window(formset, window_start, window_size, request=None, context=None, **kwargs):
+    """
+    Render the forms of formset between window_start and window_start + window_size, within the scope of the
+    formset tag called with the same keyword arguments. The formset template, its management form and the hidden
+    inputs of other forms are not rendered, so that further windows can be loaded on demand (e.g. with AJAX).
+
+    """
+    context = RequestContext(request, context) if request is not None else Context(context)
+    silhouette = Formset(context, formset, window_start=window_start, window_size=window_size, **kwargs)
+    with bind_template(context, silhouette.template), silhouette as scope:
+        return mark_safe("".join(silhouette.render_subforms(scope, scope['subforms'])))
+
+
+def render_formset_empty_form(formset, request=None, context=None, **kwargs):
+    """
+    Render the empty form of formset like the formset_empty_form tag called with the same keyword arguments.
+
+    """
+    context = RequestContext(request, context) if request is not None else Context(context)
+    silhouette = FormsetEmptyForm(context, formset, **kwargs)
+    with bind_template(context, silhouette.template):
+        return silhouette.render_in_scope()
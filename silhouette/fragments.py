@@ -0,0 +1,136 @@
+from __future__ import unicode_literals
+
+import hashlib
+
+from django.conf import settings
+from django.utils import timezone, translation
+from django.utils.encoding import force_bytes, force_text
+from django.utils.functional import Promise
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+try:
+    from django.core.cache import caches
+except ImportError:  # pragma: no cover
+    from django.core.cache import get_cache
+else:
+    def get_cache(alias):
+        return caches[alias]
+
+from . import conf, instrumentation
+from .utils import Registry
+
+#: Marker rendered in place of the CSRF token in cached fragments, substituted with the token of each request
+CSRF_PLACEHOLDER = "__silhouette_csrf_token__"
+
+#: Hidden input rendered in place of csrf_input, the CSRF field of Jinja2 templates
+CSRF_INPUT_PLACEHOLDER = format_html('<input type="hidden" name="csrfmiddlewaretoken" value="{}" />', CSRF_PLACEHOLDER)
+
+
+def get_class_path(cls):
+    return "{}.{}".format(cls.__module__, cls.__name__)
+
+
+def freeze(value):
+    """
+    Representation of value with dictionaries sorted and lazy strings translated, so that equal states produce equal
+    keys in every process.
+
+    """
+    if isinstance(value, Promise):
+        return force_text(value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def get_field_state(field):
+    """
+    State of a form field that affects its output, including the attributes and choices of its widget, which forms
+    commonly set per instance (e.g. choices depending on the user). Choices of model choice fields are queried.
+
+    """
+    widget = field.widget
+    return (get_class_path(type(field)), get_class_path(type(widget)), freeze(field.label), freeze(field.help_text),
+            field.required, freeze(field.initial), getattr(field, 'disabled', False), freeze(widget.attrs),
+            freeze(list(getattr(widget, 'choices', ()))))
+
+
+def get_form_state(form):
+    """
+    State of an unbound form that affects its output: class, prefix, ids, initial data and the state of its fields.
+
+    """
+    return (get_class_path(type(form)), form.prefix, form.auto_id, form.label_suffix, freeze(form.initial),
+            tuple((name, get_field_state(field)) for name, field in form.fields.items()))
+
+
+def get_template_version(template):
+    """
+    Digest of the template source, or of the template name when the source isn't available, so that changes to a
+    template invalidate the fragments rendered with it.
+
+    """
+    template = getattr(template, 'template', template)
+    source = getattr(template, 'source', None) or getattr(template, 'name', None) or ""
+    return hashlib.md5(force_bytes(source)).hexdigest()
+
+template_versions = Registry(get_template_version)
+
+
+def get_csrf_token(context):
+    token = context.get('csrf_token')
+    if not token or token == 'NOTPROVIDED':
+        return None
+    return force_text(token)
+
+
+def get_fragment_key(silhouette, template, has_csrf_token):
+    """
+    Cache key of the fragment rendered by silhouette. The key depends on the renderer, the template and its version,
+    the path and theme, the attributes of the tag (its arguments merged with cascaded attributes), the state of the
+    rendered object, the active language and, with USE_TZ, the current time zone.
+
+    """
+    parts = (
+        get_class_path(type(silhouette)),
+        silhouette.template_override,
+        silhouette.path_override,
+        silhouette.theme_override,
+        template_versions[template] if template is not None else None,
+        freeze(silhouette.scoped_attrs()),
+        silhouette.get_fragment_state(),
+        has_csrf_token,
+        translation.get_language(),
+        timezone.get_current_timezone_name() if settings.USE_TZ else None,
+    )
+    return "silhouette.fragment.{}".format(hashlib.md5(force_bytes(repr(parts))).hexdigest())
+
+
+def render_cached(silhouette):
+    """
+    Render silhouette through the fragment cache. Fragments are rendered with a placeholder in place of the CSRF
+    token, which is substituted with the token of the current request when the fragment is served.
+
+    """
+    context = silhouette.context
+    token = get_csrf_token(context)
+    cache = get_cache(conf.settings.FRAGMENT_CACHE)
+    key = get_fragment_key(silhouette, silhouette.find_template(), token is not None)
+    output = cache.get(key)
+    if instrumentation.listeners:
+        instrumentation.fragment_served(silhouette, output is not None)
+    if output is None:
+        if token is not None:
+            context.update({'csrf_token': CSRF_PLACEHOLDER, 'csrf_input': CSRF_INPUT_PLACEHOLDER})
+        try:
+            with silhouette as scope:
+                output = force_text(silhouette.render(scope))
+        finally:
+            if token is not None:
+                context.pop()
+        cache.set(key, output, conf.settings.FRAGMENT_CACHE_TIMEOUT)
+    if token is not None:
+        output = output.replace(CSRF_PLACEHOLDER, token)
+    return mark_safe(output)
@@ -0,0 +1,45 @@
+from __future__ import unicode_literals
+
+from django.utils import six
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from . import conf
+
+#: Serialized attributes by attribute items. Cleared when full rather than evicting entries one by one, which would
+#: cost more than serializing the few attributes of an element
+attrs_cache = {}
+
+
+def serialize_attrs(items):
+    """
+    Serialize attribute items like django.forms.utils.flatatt: attributes with a True value render as boolean
+    attributes, attributes with a False or None value are left out, and other values are escaped.
+
+    """
+    return mark_safe("".join(" {}".format(name) if value is True else " {}=\"{}\"".format(name, escape(value))
+                             for name, value in items if value is not None and value is not False))
+
+
+def flatatt(attrs):
+    """
+    Serialize html attributes, sorted by name with SILHOUETTE_CANONICAL_ATTRS. Output is cached by attribute items,
+    up to SILHOUETTE_ATTRS_CACHE_SIZE entries. Only attributes with string values are stored, as other values may
+    compare equal while rendering differently (e.g. True and 1).
+
+    """
+    settings = conf.settings
+    items = tuple(sorted(attrs.items())) if settings.CANONICAL_ATTRS else tuple(attrs.items())
+    try:
+        return attrs_cache[items]
+    except KeyError:
+        pass
+    except TypeError:
+        return serialize_attrs(items)
+    output = serialize_attrs(items)
+    size = settings.ATTRS_CACHE_SIZE
+    if size and all(isinstance(value, six.string_types) for name, value in items):
+        if len(attrs_cache) >= size:
+            attrs_cache.clear()
+        attrs_cache[items] = output
+    return output
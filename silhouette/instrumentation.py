@@ -0,0 +1,268 @@
+"""
+Opt-in instrumentation of Silhouette tags and template resolutions.
+
+Listeners added with add_listener are notified when tags render and when the loader resolves templates. Hooks are
+skipped altogether while no listeners are registered, so instrumentation costs nothing unless it's used.
+
+"""
+from __future__ import unicode_literals
+
+import threading
+import timeit
+
+#: Clock used to time renders and resolutions
+timer = timeit.default_timer
+
+#: Registered listeners. Replaced rather than modified, so that hooks can iterate over it without locking
+listeners = ()
+
+_listeners_lock = threading.Lock()
+
+
+class Listener(object):
+    """
+    Base class for listeners, receiving events of the thread they occur in.
+
+    """
+
+    def render_started(self, silhouette):
+        pass
+
+    def render_finished(self, silhouette, elapsed):
+        pass
+
+    def template_resolved(self, obj, template_type, theme, template_names, template, hit, elapsed):
+        """
+        Called when the loader resolves a template. template is None when none of template_names exist, and hit is
+        whether the resolution was served by the loader cache.
+
+        """
+        pass
+
+    def fragment_served(self, silhouette, hit):
+        pass
+
+
+def add_listener(listener):
+    global listeners
+    with _listeners_lock:
+        if listener not in listeners:
+            listeners = listeners + (listener,)
+
+
+def remove_listener(listener):
+    global listeners
+    with _listeners_lock:
+        listeners = tuple(registered for registered in listeners if registered is not listener)
+
+
+def render(silhouette, render_in_scope):
+    """
+    Call render_in_scope, notifying listeners before and after rendering.
+
+    """
+    for listener in listeners:
+        listener.render_started(silhouette)
+    start = timer()
+    try:
+        return render_in_scope()
+    finally:
+        elapsed = timer() - start
+        for listener in listeners:
+            listener.render_finished(silhouette, elapsed)
+
+
+def template_resolved(obj, template_type, theme, template_names, template, hit, elapsed):
+    for listener in listeners:
+        listener.template_resolved(obj, template_type, theme, template_names, template, hit, elapsed)
+
+
+def fragment_served(silhouette, hit):
+    for listener in listeners:
+        listener.fragment_served(silhouette, hit)
+
+
+def get_template_name(template):
+    template = getattr(template, 'template', template)
+    return getattr(template, 'name', None)
+
+
+def describe(obj):
+    """
+    Short description of a rendered object: the class name of forms and formsets, and the form class name and field
+    name of bound fields.
+
+    """
+    form = getattr(obj, 'form', None)
+    if form is not None and hasattr(obj, 'name'):
+        return "{}.{}".format(type(form).__name__, obj.name)
+    return type(obj).__name__
+
+
+class Render(object):
+    """
+    Record of a tag render: the tag, the rendered object, the template chosen among the candidate names probed,
+    whether the loader and fragment caches were hit, and the time spent rendering, with and without inner tags.
+
+    """
+
+    def __init__(self, silhouette, depth):
+        self.tag = type(silhouette).__name__
+        self.template_type = silhouette.template_type
+        self.obj = describe(silhouette.obj)
+        self.template = silhouette.template_override
+        self.candidates = (silhouette.template_override,) if silhouette.template_override else ()
+        self.loader_cache = None
+        self.fragment_cache = None
+        self.lookups = 0
+        self.depth = depth
+        self.total = 0.0
+        self.inner = 0.0
+
+    @property
+    def self_time(self):
+        return self.total - self.inner
+
+    def resolved(self, template_names, template, hit):
+        self.lookups += 1
+        if self.lookups == 1:
+            self.template = get_template_name(template)
+            self.candidates = tuple(template_names)
+            self.loader_cache = 'hit' if hit else 'miss'
+
+    def __repr__(self):
+        return "<Render {} {} {:.2f}ms>".format(self.tag, self.obj, self.total * 1000)
+
+
+class Profile(object):
+    """
+    Renders recorded in one thread, in the order they started.
+
+    """
+
+    def __init__(self):
+        self.renders = []
+        self.stack = []
+
+    @property
+    def total(self):
+        return sum(render.total for render in self.renders if render.depth == 0)
+
+    def push(self, silhouette):
+        render = Render(silhouette, len(self.stack))
+        self.renders.append(render)
+        self.stack.append(render)
+
+    def pop(self, elapsed):
+        render = self.stack.pop()
+        render.total = elapsed
+        if self.stack:
+            self.stack[-1].inner += elapsed
+
+    def slowest(self, count=None):
+        """
+        Renders sorted by the time spent in their own templates, excluding inner tags.
+
+        """
+        return sorted(self.renders, key=lambda render: render.self_time, reverse=True)[:count]
+
+
+class Profiler(Listener):
+    """
+    Record renders of the threads that started profiling, e.g. once per request. The profiler listens to tags only
+    while at least one thread is profiling. Starting is reference counted per thread: callers starting the profiler
+    on the same thread (e.g. the middleware and the debug toolbar panel) share one profile, which stops recording
+    once each of them stopped.
+
+    Forms of formsets rendered on the thread pool (see SILHOUETTE_PARALLEL_THRESHOLD) are not recorded.
+
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        self.active = 0
+        self.lock = threading.Lock()
+
+    @property
+    def profile(self):
+        return getattr(self.local, 'profile', None)
+
+    def start(self):
+        profile = self.profile
+        if profile is None:
+            with self.lock:
+                self.active += 1
+                add_listener(self)
+            profile = self.local.profile = Profile()
+            self.local.starts = 0
+        self.local.starts += 1
+        return profile
+
+    def stop(self):
+        profile = self.profile
+        if profile is not None:
+            self.local.starts -= 1
+            if not self.local.starts:
+                self.local.profile = None
+                with self.lock:
+                    self.active -= 1
+                    if not self.active:
+                        remove_listener(self)
+        return profile
+
+    def render_started(self, silhouette):
+        profile = self.profile
+        if profile is not None:
+            profile.push(silhouette)
+
+    def render_finished(self, silhouette, elapsed):
+        profile = self.profile
+        if profile is not None and profile.stack:
+            profile.pop(elapsed)
+
+    def template_resolved(self, obj, template_type, theme, template_names, template, hit, elapsed):
+        profile = self.profile
+        if profile is not None and profile.stack:
+            profile.stack[-1].resolved(template_names, template, hit)
+
+    def fragment_served(self, silhouette, hit):
+        profile = self.profile
+        if profile is not None and profile.stack:
+            profile.stack[-1].fragment_cache = 'hit' if hit else 'miss'
+
+
+profiler = Profiler()
+
+
+class profile(object):
+    """
+    Context manager profiling the renders of the current thread::
+
+        with profile() as renders:
+            template.render(context)
+        renders.slowest(10)
+
+    """
+
+    def __enter__(self):
+        return profiler.start()
+
+    def __exit__(self, *args, **kwargs):
+        profiler.stop()
+
+
+def format_render(render):
+    return "{:8.2f}ms {:8.2f}ms  {}{} {} {} ({})".format(
+        render.total * 1000, render.self_time * 1000, "  " * render.depth, render.tag, render.obj,
+        render.template or "<fallback>",
+        ", ".join("{} cache {}".format(name, state) for name, state in (('loader', render.loader_cache),
+                                                                         ('fragment', render.fragment_cache))
+                  if state is not None) or "no lookup")
+
+
+def format_profile(profile, count=None):
+    """
+    Lines describing the slowest renders of profile, with their total time and their own time.
+
+    """
+    return [format_render(render) for render in profile.slowest(count)]
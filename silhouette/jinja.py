@@ -0,0 +1,114 @@
+"""
+Jinja2 support for Silhouette.
+
+Add the extension to the Jinja2 template backend::
+
+    TEMPLATES = [
+        {
+            "BACKEND": "django.template.backends.jinja2.Jinja2",
+            "APP_DIRS": True,
+            "OPTIONS": {"environment": "silhouette.jinja.environment"},
+        },
+        ...
+    ]
+
+Silhouette tags are then available as global functions, e.g. ``{{ silhouette(form, action="/") }}`` or
+``{{ field(form.email, widget_class="form-control") }}``, and Silhouette filters as Jinja2 filters. Base templates
+are also provided as Jinja2 templates, used when the Jinja2 backend is listed before the Django backend.
+
+"""
+from __future__ import absolute_import
+
+from django.utils.encoding import force_text
+from django.utils.html import conditional_escape
+from jinja2 import Environment
+from jinja2.ext import Extension
+from markupsafe import Markup
+try:
+    from jinja2 import pass_context
+except ImportError:
+    from jinja2 import contextfunction as pass_context
+
+
+class Scope(object):
+    """
+    Stack of dictionaries standing in for Django's Context when rendering tags from Jinja2 templates.
+
+    """
+    def __init__(self, dicts, autoescape=True):
+        self.dicts = dicts
+        self.autoescape = autoescape
+
+    def __copy__(self):
+        return Scope(self.dicts[:], self.autoescape)
+
+    def __contains__(self, key):
+        return any(key in d for d in self.dicts)
+
+    def __getitem__(self, key):
+        for d in reversed(self.dicts):
+            if key in d:
+                return d[key]
+        raise KeyError(key)
+
+    def get(self, key, otherwise=None):
+        for d in reversed(self.dicts):
+            if key in d:
+                return d[key]
+        return otherwise
+
+    def update(self, other_dict):
+        self.dicts.append(other_dict)
+        return other_dict
+
+    def pop(self):
+        return self.dicts.pop()
+
+    def flatten(self):
+        flat = {}
+        for d in self.dicts:
+            flat.update(d)
+        return flat
+
+
+def make_global(silhouette_class):
+    """
+    Jinja2 global function rendering silhouette_class with the calling template's context
+
+    """
+    @pass_context
+    def render(context, obj, **kwargs):
+        scope = Scope([context.get_all()], autoescape=context.eval_ctx.autoescape)
+        output = silhouette_class(scope, obj, **kwargs).render_in_scope()
+        return Markup(conditional_escape(output)) if scope.autoescape else force_text(output)
+    return render
+
+
+def get_globals():
+    from .templatetags.silhouette_tags import silhouette_classes
+    return {name: make_global(silhouette_class) for name, silhouette_class in silhouette_classes.items()}
+
+
+def get_filters():
+    from .templatetags.silhouette_filters import register
+    return dict(register.filters)
+
+
+class SilhouetteExtension(Extension):
+    """
+    Jinja2 extension adding Silhouette tags as global functions and Silhouette filters
+
+    """
+    def __init__(self, environment):
+        super(SilhouetteExtension, self).__init__(environment)
+        environment.globals.update(get_globals())
+        environment.filters.update(get_filters())
+
+
+def environment(**options):
+    """
+    Jinja2 environment with the Silhouette extension, for the environment option of Django's Jinja2 backend
+
+    """
+    options['extensions'] = list(options.get('extensions', ())) + [SilhouetteExtension]
+    return Environment(**options)
@@ -1,41 +1,339 @@
-import re
+import json
+import logging
+import os
+import threading
+import time
+from django.conf import settings
 from django.forms.forms import BaseForm, BoundField
 from django.forms.formsets import BaseFormSet
+from django.template.loader import get_template, select_template
+from django.utils import six
+try:
+    from django.template.base import TemplateDoesNotExist
+except ImportError:  # pragma: no cover
+    from django.template.exceptions import TemplateDoesNotExist
+try:
+    from django.core.signals import setting_changed
+except ImportError:  # pragma: no cover
+    from django.test.signals import setting_changed
+try:
+    from django.utils.autoreload import file_changed
+except ImportError:  # pragma: no cover
+    file_changed = None
 
-from django.template.loader import select_template
+from . import conf, instrumentation
 from .apps import Silhouette
-from .utils import normalize
+from .utils import normalize, LRUCache, Registry
+
+
+MANIFEST_SEPARATOR = "|"
+
+logger = logging.getLogger("silhouette")
+
+
+class Names(object):
+    """
+    Normalized names of a form or formset class, and of its fields and widgets. Field names are computed on first use.
+
+    """
+    def __init__(self, cls):
+        self.substitutes = {'formset' if issubclass(cls, BaseFormSet) else 'form': normalize(cls.__name__)}
+        self.fields = {}
+        self.lock = threading.Lock()
+
+    def field_substitutes(self, name, widget_class):
+        try:
+            return self.fields[name, widget_class]
+        except KeyError:
+            with self.lock:
+                return self.fields.setdefault((name, widget_class), dict(self.substitutes,
+                                                                         field=normalize(name),
+                                                                         widget=normalize(widget_class.__name__)))
+
+
+def templates_are_cached():
+    """
+    Whether Django templates are compiled once, i.e. every Django template engine uses the cached loader.
+
+    """
+    try:
+        from django.template import engines
+    except ImportError:  # pragma: no cover
+        engine_loaders = [settings.TEMPLATE_LOADERS]
+    else:
+        engine_loaders = [engine.engine.loaders for engine in engines.all() if hasattr(engine, 'engine')]
+
+    def is_cached(template_loader):
+        name = template_loader[0] if isinstance(template_loader, (list, tuple)) else template_loader
+        return isinstance(name, six.string_types) and name.endswith(('cached.Loader', 'whitespace.Loader'))
+
+    return all(any(is_cached(template_loader) for template_loader in template_loaders)
+               for template_loaders in engine_loaders)
 
 
 class DefaultLoader(object):
+    """
+    Resolve templates from patterns. Resolved templates are cached by render signature (template type, form class,
+    field name, widget class, path and theme) so that pattern probing only happens once per signature. Signatures for
+    which no template exists are cached too, so that fallbacks don't probe patterns again.
 
-    def get_substitutes(self, obj, path, theme):
-        if isinstance(obj, BaseForm):
-            return {'path': path.strip("/"),
-                    'theme': theme,
-                    'form': normalize(type(obj).__name__)}
-        elif isinstance(obj, BaseFormSet):
-            return {'path': path.strip("/"),
-                    'theme': theme,
-                    'formset': normalize(type(obj).__name__)}
+    When DEBUG is on and Django templates aren't cached, the cache is bypassed so that edited templates are reloaded
+    like Django reloads them.
+
+    """
+    def __init__(self, cache_size=None):
+        self.cache_size = cache_size
+        self.cache = LRUCache(conf.settings.CACHE_SIZE if cache_size is None else cache_size)
+        self.names = Registry(Names)
+        self.manifest = None
+        self.bypass_cache = None
+        setting_changed.connect(self.setting_changed)
+        if file_changed is not None:  # pragma: no cover
+            file_changed.connect(self.file_changed)
+
+    def setting_changed(self, setting, **kwargs):
+        if setting.startswith(('SILHOUETTE', 'TEMPLATE', 'INSTALLED_APPS')):
+            self.clear_cache()
+        if setting == 'DEBUG' or setting.startswith('TEMPLATE'):
+            self.bypass_cache = None
+        if setting.startswith('SILHOUETTE'):
+            # Reload settings here rather than relying on conf being notified first
+            cache_size = conf.reload().CACHE_SIZE
+            if self.cache_size is None and self.cache.maxsize != cache_size:
+                self.cache = LRUCache(cache_size)
+
+    def file_changed(self, **kwargs):  # pragma: no cover
+        self.clear_cache()
+
+    def clear_cache(self):
+        self.cache.clear()
+
+    def is_cache_bypassed(self):
+        """
+        Whether resolved templates are reloaded on each render, when DEBUG is on and Django templates aren't cached.
+
+        """
+        bypass_cache = self.bypass_cache
+        if bypass_cache is None:
+            # Computed on first use, as template engines can't be loaded while this module is imported
+            bypass_cache = self.bypass_cache = settings.DEBUG and not templates_are_cached()
+        return bypass_cache
+
+    def get_signature(self, obj):
+        if isinstance(obj, (BaseForm, BaseFormSet)):
+            return (type(obj),)
         elif isinstance(obj, BoundField):
-            return {'path': path.strip("/"),
-                    'theme': theme,
-                    'form': normalize(type(obj.form).__name__),
-                    'field': normalize(obj.name),
-                    'widget': normalize(type(obj.field.widget).__name__)}
+            return (type(obj.form), obj.name, type(obj.field.widget))
         raise ValueError("Object {} of type {} is not supported by {}".format(obj, type(obj), type(self)))
 
+    def get_substitutes(self, obj, path, theme):
+        return self.get_signature_substitutes(self.get_signature(obj), path, theme)
+
+    def get_signature_substitutes(self, signature, path, theme):
+        names = self.names[signature[0]]
+        substitutes = names.field_substitutes(*signature[1:]) if len(signature) > 1 else names.substitutes
+        return dict(substitutes, path=path.strip("/"), theme=theme)
+
+    def get_template_names(self, signature, path, theme, patterns):
+        substitutes = self.get_signature_substitutes(signature, path, theme)
+        return tuple(format_pattern(substitutes) for format_pattern in conf.compile_patterns(patterns))
+
+    def select_template(self, template_names):
+        return select_template(template_names)
+
+    def load_manifest(self, filename):
+        """
+        Load a manifest of resolved template names written by the silhouette_compile command. A missing manifest is
+        logged and ignored, so that templates are resolved from patterns until the command writes it.
+
+        """
+        if not os.path.exists(filename):
+            logger.warning("Silhouette manifest %s does not exist, run silhouette_compile to create it", filename)
+            self.manifest = None
+            self.clear_cache()
+            return
+        with open(filename) as manifest:
+            self.manifest = json.load(manifest)['templates']
+        self.clear_cache()
+
+    def load_template(self, template_names):
+        """
+        Load the first template that exists. When the manifest knows which template wins, it is loaded directly.
+
+        """
+        if self.manifest is not None:
+            try:
+                template_name = self.manifest[MANIFEST_SEPARATOR.join(template_names)]
+            except KeyError:
+                pass
+            else:
+                if template_name is None:
+                    raise TemplateDoesNotExist(", ".join(template_names))
+                return get_template(template_name)
+        return self.select_template(template_names)
+
+    def resolve(self, obj, template_type, path=None, theme=None, patterns=None):
+        """
+        Resolve a template for obj, returning either the template or the names that were tried when none exists.
+
+        """
+        settings = conf.settings
+        path = path or settings.PATH
+        theme = theme or settings.THEME
+        if patterns is None:
+            # Default patterns are only keyed by template type, as the cache is cleared when settings change
+            patterns = settings.PATTERNS[template_type]
+            key = (template_type, None, path, theme)
+        else:
+            patterns = tuple(patterns[template_type])
+            key = (template_type, patterns, path, theme)
+        signature = self.get_signature(obj)
+        key += signature
+        listeners = instrumentation.listeners
+        if listeners:
+            start = instrumentation.timer()
+        bypass_cache = self.is_cache_bypassed()
+        template = None if bypass_cache else self.cache.get(key)
+        hit = template is not None
+        if not hit:
+            template_names = self.get_template_names(signature, path, theme, patterns)
+            try:
+                template = self.load_template(template_names)
+            except TemplateDoesNotExist:
+                template = template_names
+            if not bypass_cache:
+                self.cache.set(key, template)
+        if listeners:
+            elapsed = instrumentation.timer() - start
+            instrumentation.template_resolved(obj, template_type, theme,
+                                              self.get_template_names(signature, path, theme, patterns),
+                                              None if isinstance(template, tuple) else template, hit, elapsed)
+        return template
+
+    def find_template(self, obj, template_type, path=None, theme=None, patterns=None):
+        """
+        Load a template for obj, or return None when none of the patterns match.
+
+        """
+        template = self.resolve(obj, template_type, path=path, theme=theme, patterns=patterns)
+        return None if isinstance(template, tuple) else template
+
     def get_template(self, obj, template_type, path=None, theme=None, patterns=None):
-        path = path or Silhouette.PATH
-        theme = theme or Silhouette.THEME
-        patterns = patterns or Silhouette.PATTERNS
-        substitutes = self.get_substitutes(obj, path, theme)
-        templates = [pattern.format(**substitutes) for pattern in patterns[template_type]]
-        return select_template(templates)
+        """
+        Load a template for obj, or raise TemplateDoesNotExist when none of the patterns match.
+
+        """
+        template = self.resolve(obj, template_type, path=path, theme=theme, patterns=patterns)
+        if isinstance(template, tuple):
+            raise TemplateDoesNotExist(", ".join(template))
+        return template
 
     def __call__(self, *args, **kwargs):
         return self.get_template(*args, **kwargs)
 
 
+def get_template_directories():
+    """
+    Directories searched by the configured template engines and their loaders.
+
+    """
+    try:
+        from django.template import engines
+    except ImportError:  # pragma: no cover
+        from django.template.loaders.app_directories import app_template_dirs
+        return list(settings.TEMPLATE_DIRS) + list(app_template_dirs)
+
+    def loader_directories(template_loader):
+        for inner_loader in getattr(template_loader, 'loaders', ()):
+            for directory in loader_directories(inner_loader):
+                yield directory
+        if hasattr(template_loader, 'get_dirs'):
+            for directory in template_loader.get_dirs():
+                yield directory
+
+    directories = []
+    for engine in engines.all():
+        directories.extend(engine.template_dirs)
+        for template_loader in getattr(getattr(engine, 'engine', None), 'template_loaders', ()):
+            directories.extend(loader_directories(template_loader))
+    return [directory for i, directory in enumerate(directories) if directory not in directories[:i]]
+
+
+class IndexedLoader(DefaultLoader):
+    """
+    Resolve patterns against an index of the template names found in template directories, so that only the
+    winning template is loaded. The index is built on first use and frozen, unless DEBUG is on, in which case
+    template directories are rescanned and resolved templates are cleared when templates are added, removed or
+    edited. Templates are checked for changes at most once every check_interval seconds.
+
+    Templates that don't live in template directories (e.g. with the locmem loader) are not found by this loader.
+
+    """
+    #: Minimum number of seconds between checks of templates for changes, when DEBUG is on
+    check_interval = 1.0
+
+    def __init__(self, *args, **kwargs):
+        self.index = None
+        self.index_lock = threading.Lock()
+        self.mtimes = {}
+        self.last_check = 0
+        super(IndexedLoader, self).__init__(*args, **kwargs)
+
+    def clear_cache(self):
+        super(IndexedLoader, self).clear_cache()
+        self.index = None
+
+    def scan(self):
+        """
+        Walk template directories, returning the names of all templates found and the modification times of the
+        directories walked and of the templates in them, so that both added or removed and edited templates are
+        detected.
+
+        """
+        names, mtimes = set(), {}
+        for directory in get_template_directories():
+            for root, dirs, files in os.walk(directory):
+                mtimes[root] = os.stat(root).st_mtime
+                for filename in files:
+                    path = os.path.join(root, filename)
+                    mtimes[path] = os.stat(path).st_mtime
+                    names.add(os.path.relpath(path, directory).replace(os.sep, '/'))
+        return frozenset(names), mtimes
+
+    def is_stale(self):
+        for path, mtime in six.iteritems(self.mtimes):
+            try:
+                if os.stat(path).st_mtime != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def get_index(self):
+        index = self.index
+        if index is None:
+            with self.index_lock:
+                if self.index is None:
+                    self.index, self.mtimes = self.scan()
+                    self.last_check = time.time()
+                index = self.index
+        return index
+
+    def resolve(self, *args, **kwargs):
+        if settings.DEBUG and self.index is not None:
+            now = time.time()
+            if now - self.last_check >= self.check_interval:
+                self.last_check = now
+                if self.is_stale():
+                    self.clear_cache()
+        return super(IndexedLoader, self).resolve(*args, **kwargs)
+
+    def select_template(self, template_names):
+        index = self.get_index()
+        for template_name in template_names:
+            if template_name in index:
+                return get_template(template_name)
+        raise TemplateDoesNotExist(", ".join(template_names))
+
+
 get_silhouette = loader = Silhouette.settings.LOADER()
@@ -0,0 +1,27 @@
+from optparse import make_option
+from django.core.management.base import BaseCommand, CommandError
+
+from ...apps import Silhouette
+from ...loaders import loader
+from ...manifest import get_form_classes, build_manifest, write_manifest
+
+
+class Command(BaseCommand):
+    help = "Resolve the templates of all forms and write them to the manifest loaded by Silhouette on startup."
+
+    if not hasattr(BaseCommand, 'add_arguments'):  # pragma: no cover
+        option_list = BaseCommand.option_list + (
+            make_option('--output', dest='output', help="Manifest file (defaults to the SILHOUETTE_MANIFEST setting)"),
+        )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', dest='output', help="Manifest file (defaults to the SILHOUETTE_MANIFEST setting)")
+
+    def handle(self, *args, **options):
+        output = options.get('output') or Silhouette.MANIFEST
+        if not output:
+            raise CommandError("No manifest file: set SILHOUETTE_MANIFEST or use --output.")
+        form_classes = get_form_classes()
+        manifest = build_manifest(loader, form_classes)
+        write_manifest(manifest, output)
+        self.stdout.write("Resolved {} templates for {} form classes in {}".format(len(manifest), len(form_classes), output))
@@ -0,0 +1,127 @@
+"""
+Manifest of resolved templates. The manifest maps the candidate template names of every template type, for every
+form, formset, field and widget combination, to the template that wins, so that workers start with resolved templates.
+
+"""
+import json
+import sys
+from importlib import import_module
+from string import Formatter
+from django.forms.forms import BaseForm
+from django.forms.formsets import BaseFormSet
+from django.template.loader import get_template
+from django.utils import six
+from django.utils.module_loading import module_has_submodule
+try:
+    from django.template.base import TemplateDoesNotExist
+except ImportError:  # pragma: no cover
+    from django.template.exceptions import TemplateDoesNotExist
+
+from .apps import Silhouette
+from .loaders import MANIFEST_SEPARATOR
+
+
+def get_subclasses(cls):
+    subclasses = set()
+    for subclass in cls.__subclasses__():
+        subclasses.add(subclass)
+        subclasses.update(get_subclasses(subclass))
+    return subclasses
+
+
+def is_base_class(cls):
+    """
+    Whether cls is one of Django's own form or formset base classes (formset_factory classes belong to django.forms too).
+
+    """
+    return cls.__module__.startswith('django.forms') and getattr(sys.modules[cls.__module__], cls.__name__, None) is cls
+
+
+def get_form_classes():
+    """
+    Form and formset classes listed in the COMPILE_FORMS setting or, by default, defined in the forms modules of
+    installed apps.
+
+    """
+    if Silhouette.COMPILE_FORMS:
+        return list(Silhouette.COMPILE_FORMS)
+    try:
+        from django.apps import apps
+        modules = [(app_config.name, app_config.module) for app_config in apps.get_app_configs()]
+    except ImportError:  # pragma: no cover
+        from django.conf import settings
+        modules = [(app, import_module(app)) for app in settings.INSTALLED_APPS]
+    for name, module in modules:
+        if module_has_submodule(module, 'forms'):
+            import_module('{}.forms'.format(name))
+    return sorted((cls for cls in get_subclasses(BaseForm) | get_subclasses(BaseFormSet) if not is_base_class(cls)),
+                  key=lambda cls: (cls.__module__, cls.__name__))
+
+
+def get_template_types(patterns):
+    """
+    Group template types by the kind of object they render ("form", "formset" or "field"), based on the
+    placeholders used by their patterns. Template types without object placeholders are left out.
+
+    """
+    template_types = {'form': [], 'formset': [], 'field': []}
+    for template_type, type_patterns in six.iteritems(patterns):
+        placeholders = {field for pattern in type_patterns for _, field, _, _ in Formatter().parse(pattern) if field}
+        if placeholders & {'field', 'widget'}:
+            template_types['field'].append(template_type)
+        elif 'formset' in placeholders:
+            template_types['formset'].append(template_type)
+        elif 'form' in placeholders:
+            template_types['form'].append(template_type)
+    return template_types
+
+
+def get_signatures(form_classes, template_types):
+    """
+    Yield loader signatures with the template types that apply to them.
+
+    """
+    form_classes = list(form_classes)
+    for cls in form_classes:
+        if issubclass(cls, BaseFormSet):
+            yield (cls,), template_types['formset']
+            if getattr(cls, 'form', None) is not None and cls.form not in form_classes:
+                form_classes.append(cls.form)
+        else:
+            yield (cls,), template_types['form']
+            for name, field in six.iteritems(cls.base_fields):
+                yield (cls, name, type(field.widget)), template_types['field']
+
+
+def find_template_name(template_names):
+    for template_name in template_names:
+        try:
+            get_template(template_name)
+        except TemplateDoesNotExist:
+            continue
+        return template_name
+    return None
+
+
+def build_manifest(loader, form_classes, path=None, theme=None, patterns=None):
+    """
+    Resolve every template type for every form, formset, field and widget combination, returning a mapping of
+    candidate names to the winning template name, or None when no template exists.
+
+    """
+    path = path or Silhouette.PATH
+    theme = theme or Silhouette.THEME
+    patterns = patterns or Silhouette.PATTERNS
+    manifest = {}
+    for signature, template_types in get_signatures(form_classes, get_template_types(patterns)):
+        for template_type in template_types:
+            template_names = loader.get_template_names(signature, path, theme, patterns[template_type])
+            key = MANIFEST_SEPARATOR.join(template_names)
+            if key not in manifest:
+                manifest[key] = find_template_name(template_names)
+    return manifest
+
+
+def write_manifest(manifest, filename):
+    with open(filename, 'w') as output:
+        json.dump({'templates': manifest}, output, indent=2, sort_keys=True)
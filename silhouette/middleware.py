@@ -0,0 +1,30 @@
+import logging
+
+try:
+    from django.utils.deprecation import MiddlewareMixin
+except ImportError:  # pragma: no cover
+    MiddlewareMixin = object
+
+from . import conf
+from .instrumentation import profiler, format_profile
+
+logger = logging.getLogger("silhouette.profile")
+
+
+class ProfileMiddleware(MiddlewareMixin):
+    """
+    Profile Silhouette tags rendered by each request, and log the SILHOUETTE_PROFILE_SLOWEST slowest renders to the
+    silhouette.profile logger at the INFO level.
+
+    """
+
+    def process_request(self, request):
+        profiler.start()
+
+    def process_response(self, request, response):
+        profile = profiler.stop()
+        if profile is not None and profile.renders and logger.isEnabledFor(logging.INFO):
+            logger.info("%s tags rendered in %.2fms by %s %s, slowest (total, self):\n%s",
+                        len(profile.renders), profile.total * 1000, request.method, request.path,
+                        "\n".join(format_profile(profile, conf.settings.PROFILE_SLOWEST)))
+        return response
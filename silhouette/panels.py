@@ -0,0 +1,52 @@
+"""
+Panel for django-debug-toolbar listing the Silhouette tags rendered by a request. Add it to the toolbar panels::
+
+    DEBUG_TOOLBAR_PANELS = [
+        ...
+        "silhouette.panels.SilhouettePanel",
+    ]
+
+"""
+from __future__ import absolute_import, unicode_literals
+
+from debug_toolbar.panels import Panel
+
+from .instrumentation import profiler
+
+
+class SilhouettePanel(Panel):
+    title = "Silhouette"
+    template = "silhouette/debug_toolbar/panel.html"
+
+    @property
+    def nav_subtitle(self):
+        stats = self.get_stats()
+        if not stats:
+            return ""
+        return "{} tags in {:.2f}ms".format(len(stats['renders']), stats['total'])
+
+    def enable_instrumentation(self):
+        self.profile = profiler.start()
+
+    def disable_instrumentation(self):
+        profiler.stop()
+
+    def process_response(self, request, response):
+        profile = getattr(self, 'profile', None)
+        if profile is not None:
+            self.record_stats({
+                'total': profile.total * 1000,
+                'renders': [{
+                    'tag': render.tag,
+                    'template_type': render.template_type,
+                    'obj': render.obj,
+                    'template': render.template,
+                    'candidates': render.candidates,
+                    'loader_cache': render.loader_cache,
+                    'fragment_cache': render.fragment_cache,
+                    'depth': render.depth,
+                    'indent': "  " * render.depth,
+                    'total': render.total * 1000,
+                    'self_time': render.self_time * 1000,
+                } for render in profile.renders],
+            })
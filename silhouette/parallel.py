@@ -0,0 +1,106 @@
+import threading
+from multiprocessing.pool import ThreadPool
+
+from django.conf import settings
+from django.db import connections
+from django.forms.models import BaseModelFormSet, ModelChoiceField
+from django.utils import timezone, translation
+
+from . import conf
+
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_pool():
+    """
+    Thread pool shared by parallel renderers, created on first use with SILHOUETTE_PARALLEL_WORKERS threads. The pool
+    is replaced when the setting changes, letting the previous pool finish its tasks.
+
+    """
+    global _pool, _pool_workers
+    workers = conf.settings.PARALLEL_WORKERS
+    if _pool is None or _pool_workers != workers:
+        with _pool_lock:
+            if _pool is None or _pool_workers != workers:
+                if _pool is not None:
+                    _pool.close()
+                _pool, _pool_workers = ThreadPool(workers), workers
+    return _pool
+
+
+def is_enabled():
+    """
+    Whether items can be rendered on the pool: SILHOUETTE_PARALLEL_WORKERS = 0 renders everything serially, and
+    nested parallel renderers render in the current thread.
+
+    """
+    return bool(conf.settings.PARALLEL_WORKERS) and not in_worker()
+
+
+def in_worker():
+    """
+    Whether the current thread is a worker of the pool. Nested parallel renderers must render in the current thread,
+    as waiting for the pool from one of its workers could deadlock.
+
+    """
+    return getattr(_local, 'worker', False)
+
+
+def queries_database(formset, forms):
+    """
+    Whether rendering the forms of formset may query the database, i.e. formset is a model formset or its forms have
+    model choice fields. Pool threads have their own connections, outside of the transaction of the request, so these
+    formsets are rendered in the current thread.
+
+    """
+    if isinstance(formset, BaseModelFormSet):
+        return True
+    return any(isinstance(field, ModelChoiceField) for form in forms[:1] for field in form.fields.values())
+
+
+def close_connections():
+    """
+    Close the database connections opened by the current thread.
+
+    """
+    for connection in connections.all():
+        if connection.connection is not None:
+            connection.close()
+
+
+class Worker(object):
+    """
+    Callable applying func in a pool thread, with the language and time zone active in the thread that created it.
+    Database connections opened by func are closed afterwards, as request_finished never closes them.
+
+    """
+    def __init__(self, func):
+        self.func = func
+        self.language = translation.get_language()
+        self.timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+
+    def __call__(self, item):
+        _local.worker = True
+        try:
+            with translation.override(self.language):
+                if self.timezone is None:
+                    return self.func(item)
+                with timezone.override(self.timezone):
+                    return self.func(item)
+        finally:
+            _local.worker = False
+            close_connections()
+
+
+def imap(func, iterable):
+    """
+    Apply func to each item of iterable on the thread pool, and return an iterator of the results in order. Items
+    are applied in the current thread when the pool is disabled.
+
+    """
+    if not is_enabled():
+        return (func(item) for item in iterable)
+    return get_pool().imap(Worker(func), iterable)
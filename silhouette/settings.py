@@ -41,6 +41,11 @@ PATTERNS = {
         "{path}/{theme}/formsets/errors.html",
         "silhouette/base/formsets/errors.html",
     ),
+    'formset_form': (
+        "{path}/{form}/formset_form.html",
+        "{path}/{theme}/formsets/form.html",
+        "silhouette/base/formsets/form.html",
+    ),
     'field': (
         "{path}/{form}/fields/{field}.html",
         "{path}/{form}/fields/{widget}_field.html",
@@ -80,3 +85,36 @@ PATTERNS = {
         # Silhouette renders the default widget when no templates are found, and therefore does not provide a base template
     ),
 }
+
+# Maximum number of resolved templates kept in the loader cache, about 5 per field. None keeps every template, 0 disables the cache
+CACHE_SIZE = 10000
+
+# Manifest of resolved templates written by the silhouette_compile management command and loaded on startup
+MANIFEST = None
+
+# Form and formset classes compiled by silhouette_compile, as import paths. By default, forms modules of installed apps are searched
+COMPILE_FORMS = ()
+
+# Render html attributes sorted by name, so that identical attributes always render identical html
+CANONICAL_ATTRS = False
+
+# Cache alias used to store fragments rendered by tags called with cache=True
+FRAGMENT_CACHE = "default"
+
+# Timeout of cached fragments, in seconds
+FRAGMENT_CACHE_TIMEOUT = 300
+
+# Formsets with at least this many forms render their forms on a thread pool. None disables parallel rendering
+PARALLEL_THRESHOLD = None
+
+# Number of threads rendering forms of large formsets. 0 renders them in the calling thread
+PARALLEL_WORKERS = 4
+
+# Number of the slowest renders logged per request by silhouette.middleware.ProfileMiddleware
+PROFILE_SLOWEST = 10
+
+# Collect process-wide statistics of renders and template resolutions on startup, see silhouette.stats
+STATS = False
+
+# Maximum number of serialized html attributes cached by the to_html_attrs filter. Set to 0 to disable the cache
+ATTRS_CACHE_SIZE = 1024
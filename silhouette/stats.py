@@ -0,0 +1,211 @@
+"""
+Process-wide statistics of Silhouette tag renders and template resolutions.
+
+Statistics are collected once enabled, either with enable() or with SILHOUETTE_STATS = True. Renders and resolutions
+are broken down by template type, form class and theme. Expose them from your own metrics view, e.g.::
+
+    def metrics(request):
+        return HttpResponse(stats.prometheus(), content_type=stats.PROMETHEUS_CONTENT_TYPE)
+
+"""
+from __future__ import unicode_literals
+
+import bisect
+import threading
+
+from django.forms.forms import BoundField
+
+from . import conf, instrumentation
+
+#: Upper bounds of the latency histograms buckets, in seconds
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram(object):
+    """
+    Latency histogram counting observations per bucket, along with their count and sum.
+
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self):
+        """
+        Count, sum, and cumulative counts of observations less than or equal to each bucket bound.
+
+        """
+        cumulative, total = [], 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return {'count': self.count, 'sum': self.sum, 'buckets': cumulative}
+
+
+def get_form_class_name(obj):
+    return type(obj.form if isinstance(obj, BoundField) else obj).__name__
+
+
+class Collector(instrumentation.Listener):
+    """
+    Collect statistics of every thread, keyed by (template type, form class, theme).
+
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.renders = {}
+            self.resolutions = {}
+            self.lookups = {}
+            self.fallbacks = {}
+            self.fragments = {}
+
+    def observe(self, histograms, key, value):
+        try:
+            histogram = histograms[key]
+        except KeyError:
+            histogram = histograms[key] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    @staticmethod
+    def increment(counters, key):
+        counters[key] = counters.get(key, 0) + 1
+
+    def render_finished(self, silhouette, elapsed):
+        key = (silhouette.template_type, get_form_class_name(silhouette.obj),
+               silhouette.theme_override or conf.settings.THEME)
+        with self.lock:
+            self.observe(self.renders, key, elapsed)
+
+    def template_resolved(self, obj, template_type, theme, template_names, template, hit, elapsed):
+        key = (template_type, get_form_class_name(obj), theme)
+        with self.lock:
+            self.observe(self.resolutions, key, elapsed)
+            self.increment(self.lookups, key + ('hit' if hit else 'miss',))
+            if template is None:
+                self.increment(self.fallbacks, key)
+
+    def fragment_served(self, silhouette, hit):
+        key = (silhouette.template_type, get_form_class_name(silhouette.obj),
+               silhouette.theme_override or conf.settings.THEME, 'hit' if hit else 'miss')
+        with self.lock:
+            self.increment(self.fragments, key)
+
+    def snapshot(self):
+        """
+        Copy of the statistics collected so far. Histograms and counters are keyed by (template type, form class,
+        theme), and by hit or miss for cache lookups.
+
+        """
+        with self.lock:
+            snapshot = {
+                'renders': {key: histogram.snapshot() for key, histogram in self.renders.items()},
+                'resolutions': {key: histogram.snapshot() for key, histogram in self.resolutions.items()},
+                'lookups': dict(self.lookups),
+                'fallbacks': dict(self.fallbacks),
+                'fragments': dict(self.fragments),
+            }
+        snapshot['loader_hit_ratio'] = hit_ratio(snapshot['lookups'])
+        snapshot['fragment_hit_ratio'] = hit_ratio(snapshot['fragments'])
+        return snapshot
+
+
+def hit_ratio(counters):
+    """
+    Ratio of hits among counters keyed by tuples ending with 'hit' or 'miss', or None when nothing was counted.
+
+    """
+    hits = sum(count for key, count in counters.items() if key[-1] == 'hit')
+    total = sum(counters.values())
+    return float(hits) / total if total else None
+
+
+collector = Collector()
+
+
+def enable():
+    instrumentation.add_listener(collector)
+
+
+def disable():
+    instrumentation.remove_listener(collector)
+
+
+def is_enabled():
+    return collector in instrumentation.listeners
+
+
+def snapshot():
+    return collector.snapshot()
+
+
+def reset():
+    collector.reset()
+
+
+LABELS = ('template_type', 'form', 'theme')
+
+
+def format_labels(names, values, **extra):
+    pairs = list(zip(names, values)) + sorted(extra.items())
+    return ",".join('{}="{}"'.format(name, escape_label(value)) for name, value in pairs)
+
+
+def escape_label(value):
+    return "{}".format(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_bound(bound):
+    return "+Inf" if bound == float('inf') else repr(bound)
+
+
+def prometheus_histogram(name, documentation, histograms):
+    lines = ["# HELP {} {}".format(name, documentation), "# TYPE {} histogram".format(name)]
+    for key, histogram in sorted(histograms.items()):
+        for bound, count in histogram['buckets']:
+            lines.append("{}_bucket{{{}}} {}".format(name, format_labels(LABELS, key, le=format_bound(bound)), count))
+        lines.append("{}_sum{{{}}} {}".format(name, format_labels(LABELS, key), repr(histogram['sum'])))
+        lines.append("{}_count{{{}}} {}".format(name, format_labels(LABELS, key), histogram['count']))
+    return lines
+
+
+def prometheus_counter(name, documentation, counters, labels=LABELS):
+    lines = ["# HELP {} {}".format(name, documentation), "# TYPE {} counter".format(name)]
+    for key, count in sorted(counters.items()):
+        lines.append("{}{{{}}} {}".format(name, format_labels(labels, key), count))
+    return lines
+
+
+def prometheus(snapshot=None):
+    """
+    Statistics in the Prometheus text exposition format, for the given snapshot or the current statistics.
+
+    """
+    snapshot = collector.snapshot() if snapshot is None else snapshot
+    lines = []
+    lines.extend(prometheus_histogram("silhouette_render_seconds", "Time spent rendering Silhouette tags.",
+                                      snapshot['renders']))
+    lines.extend(prometheus_histogram("silhouette_resolve_seconds", "Time spent resolving Silhouette templates.",
+                                      snapshot['resolutions']))
+    lines.extend(prometheus_counter("silhouette_template_lookups_total", "Template lookups by loader cache result.",
+                                    snapshot['lookups'], LABELS + ('result',)))
+    lines.extend(prometheus_counter("silhouette_template_fallbacks_total",
+                                    "Template lookups for which no template exists.", snapshot['fallbacks']))
+    lines.extend(prometheus_counter("silhouette_fragment_cache_total", "Fragment cache lookups by result.",
+                                    snapshot['fragments'], LABELS + ('result',)))
+    return "\n".join(lines) + "\n"
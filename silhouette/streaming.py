@@ -0,0 +1,36 @@
+from __future__ import unicode_literals
+
+from contextlib import contextmanager
+
+from django.template.context import Context, RequestContext
+
+from .templatetags.silhouette_tags import Formset
+
+
+@contextmanager
+def bind_template(context, template):
+    """
+    Bind context to template for the whole stream, so that context processors only run once rather than for each
+    rendered form. Contexts of Django < 1.8 are populated when created and are left as is.
+
+    """
+    if getattr(context, 'template', True) is None:
+        with context.bind_template(getattr(template, 'template', template)):
+            yield
+    else:
+        yield
+
+
+def stream_formset(formset, request=None, context=None, **kwargs):
+    """
+    Render formset like the formset tag does, but yield the output chunk by chunk for use with StreamingHttpResponse.
+
+    The formset template is rendered without its forms, which are then rendered one at a time with the formset_form
+    template, within the scope of the formset. Templates overriding the forms block are rendered in one chunk.
+
+    """
+    context = RequestContext(request, context) if request is not None else Context(context)
+    silhouette = Formset(context, formset, **kwargs)
+    with bind_template(context, silhouette.template), silhouette as scope:
+        for chunk in silhouette.render_chunks(scope):
+            yield chunk
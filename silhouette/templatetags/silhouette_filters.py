@@ -1,8 +1,7 @@
 from django.template import Library
-from django.forms import widgets
-from django.forms.extras import widgets as extra_widgets
-from django.utils.html import escape
-from django.utils.safestring import mark_safe
+
+from ..html import flatatt
+from ..widgets import get_widget_kind, is_widget_kind
 
 
 register = Library()
@@ -10,109 +9,114 @@ register = Library()
 
 @register.filter
 def to_html_attrs(attrs):
-    return mark_safe("".join([" {}=\"{}\"".format(attr, escape(val)) for attr, val in attrs.items()]))
+    return flatatt(attrs)
+
+
+@register.filter
+def widget_kind(bound_field):
+    return get_widget_kind(bound_field.field.widget)
 
 
 @register.filter
 def is_text_input(bound_field):
-    return isinstance(bound_field.field.widget, widgets.TextInput)
+    return is_widget_kind(bound_field.field.widget, 'text_input')
 
 
 @register.filter
 def is_number_input(bound_field):
-    return isinstance(bound_field.field.widget, widgets.NumberInput)
+    return is_widget_kind(bound_field.field.widget, 'number_input')
 
 
 @register.filter
 def is_email_input(bound_field):
-    return isinstance(bound_field.field.widget, widgets.EmailInput)
+    return is_widget_kind(bound_field.field.widget, 'email_input')
 
 
 @register.filter
 def is_date_input(bound_field):
-    return isinstance(bound_field.field.widget, widgets.DateInput)
+    return is_widget_kind(bound_field.field.widget, 'date_input')
 
 
 @register.filter
 def is_datetime_input(bound_field):
-    return isinstance(bound_field.field.widget, widgets.DateTimeInput)
+    return is_widget_kind(bound_field.field.widget, 'datetime_input')
 
 
 @register.filter
 def is_split_datetime_widget(bound_field):
-    return isinstance(bound_field.field.widget, widgets.SplitDateTimeWidget)
+    return is_widget_kind(bound_field.field.widget, 'split_datetime_widget')
 
 
 @register.filter
 def is_time_input(bound_field):
-    return isinstance(bound_field.field.widget, widgets.TimeInput)
+    return is_widget_kind(bound_field.field.widget, 'time_input')
 
 
 @register.filter
 def is_url_input(bound_field):
-    return isinstance(bound_field.field.widget, widgets.URLInput)
+    return is_widget_kind(bound_field.field.widget, 'url_input')
 
 
 @register.filter
 def is_password_input(bound_field):
-    return isinstance(bound_field.field.widget, widgets.PasswordInput)
+    return is_widget_kind(bound_field.field.widget, 'password_input')
 
 
 @register.filter
 def is_hidden_input(bound_field):
-    return isinstance(bound_field.field.widget, widgets.HiddenInput)
+    return is_widget_kind(bound_field.field.widget, 'hidden_input')
 
 
 @register.filter
 def is_multiple_hidden_input(bound_field):
-    return isinstance(bound_field.field.widget, widgets.MultipleHiddenInput)
+    return is_widget_kind(bound_field.field.widget, 'multiple_hidden_input')
 
 
 @register.filter
 def is_file_input(bound_field):
-    return isinstance(bound_field.field.widget, widgets.FileInput)
+    return is_widget_kind(bound_field.field.widget, 'file_input')
 
 
 @register.filter
 def is_clearable_file_input(bound_field):
-    return isinstance(bound_field.field.widget, widgets.ClearableFileInput)
+    return is_widget_kind(bound_field.field.widget, 'clearable_file_input')
 
 
 @register.filter
 def is_textarea(bound_field):
-    return isinstance(bound_field.field.widget, widgets.Textarea)
+    return is_widget_kind(bound_field.field.widget, 'textarea')
 
 
 @register.filter
 def is_checkbox_input(bound_field):
-    return isinstance(bound_field.field.widget, widgets.CheckboxInput)
+    return is_widget_kind(bound_field.field.widget, 'checkbox_input')
 
 
 @register.filter
 def is_select(bound_field):
-    return isinstance(bound_field.field.widget, widgets.Select)
+    return is_widget_kind(bound_field.field.widget, 'select')
 
 
 @register.filter
 def is_select_multiple(bound_field):
-    return isinstance(bound_field.field.widget, widgets.SelectMultiple)
+    return is_widget_kind(bound_field.field.widget, 'select_multiple')
 
 
 @register.filter
 def is_radio_select(bound_field):
-    return isinstance(bound_field.field.widget, widgets.RadioSelect)
+    return is_widget_kind(bound_field.field.widget, 'radio_select')
 
 
 @register.filter
 def is_checkbox_select_multiple(bound_field):
-    return isinstance(bound_field.field.widget, widgets.CheckboxSelectMultiple)
+    return is_widget_kind(bound_field.field.widget, 'checkbox_select_multiple')
 
 
 @register.filter
 def is_null_boolean_select(bound_field):
-    return isinstance(bound_field.field.widget, widgets.NullBooleanSelect)
+    return is_widget_kind(bound_field.field.widget, 'null_boolean_select')
 
 
 @register.filter
 def is_select_date_widget(bound_field):
-    return isinstance(bound_field.field.widget, extra_widgets.SelectDateWidget)
+    return is_widget_kind(bound_field.field.widget, 'select_date_widget')
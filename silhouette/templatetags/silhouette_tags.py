@@ -1,39 +1,151 @@
 from __future__ import unicode_literals
 
-import re
+import copy
+import itertools
+
+import django
 from django.template import Library
+from django.template.base import Node, Template, Variable, TemplateSyntaxError, token_kwargs
+from django.template.context import BaseContext, Context
 from django.template.loader import get_template
+from django.template.loader_tags import BlockNode, ExtendsNode
 from django.utils import six
 from django.utils.encoding import force_text
+from django.utils.functional import cached_property
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
 try:
     from django.template.base import TemplateDoesNotExist
 except ImportError:
     from django.template.exceptions import TemplateDoesNotExist
 
+from .. import conf, fragments, instrumentation, parallel, whitespace
 from ..loaders import get_silhouette
-from ..utils import normalize
+from ..utils import normalize, prefix_matcher, Registry
+from ..widgets import get_widget_kind
 
 register = Library()
 
+#: Silhouette classes by tag name, e.g. for template engines other than Django's
+silhouette_classes = {}
+
+template_types = Registry(lambda silhouette_class: normalize(silhouette_class.__name__))
+
+#: Whether output is escaped when autoescaping is on, like simple_tag does from Django 1.9
+ESCAPE_OUTPUT = django.VERSION >= (1, 9)
+
+
+class SilhouetteNode(Node):
+    """
+    Node rendering a Silhouette class.
+
+    Literal keyword arguments are resolved, merged and split into attributes once when the template is compiled.
+    Only variable keyword arguments are resolved when rendering. Like simple_tag, the output is stored in a context
+    variable instead when the tag ends with "as <name>".
+
+    """
+    OPTIONS = ('template', 'theme', 'path', 'cache')
+
+    def __init__(self, silhouette_class, obj, kwargs, target_var=None):
+        self.silhouette_class = silhouette_class
+        self.obj = obj
+        self.target_var = target_var
+        self.literals = {}
+        self.variables = {}
+        for name, expression in six.iteritems(kwargs):
+            if self.is_literal(expression):
+                self.literals[name] = expression.var.literal if isinstance(expression.var, Variable) else expression.var
+            else:
+                self.variables[name] = expression
+        if any(name not in self.OPTIONS for name in self.variables):
+            self.compiled_attrs = None
+        else:
+            self.compiled_attrs = silhouette_class.compile_attrs({name: value for name, value in six.iteritems(self.literals)
+                                                                  if name not in self.OPTIONS})
+
+    @staticmethod
+    def is_literal(expression):
+        if expression.filters:
+            return False
+        if isinstance(expression.var, Variable):
+            return expression.var.literal is not None and not expression.var.translate
+        return True
+
+    def render(self, context):
+        kwargs = dict(self.literals)
+        for name, expression in six.iteritems(self.variables):
+            kwargs[name] = expression.resolve(context)
+        silhouette = self.silhouette_class(context, self.obj.resolve(context), **kwargs)
+        if self.compiled_attrs is not None:
+            silhouette.compiled_attrs = self.compiled_attrs
+        output = silhouette.render_in_scope()
+        if self.target_var is not None:
+            context[self.target_var] = output
+            return ""
+        return conditional_escape(output) if ESCAPE_OUTPUT and context.autoescape else output
+
 
 def silhouette_tag(tag_name):
     """
     Register a class as a template tag.
 
     The class must be initialised with a context, and object and keyword arguments,
-    and implement __enter__, __exit__ and render
+    and implement compile_attrs and render_in_scope
 
     """
     def register_tag(silhouette_class):
-        def tag(context, obj, **kwargs):
-            silhouette = silhouette_class(context, obj, **kwargs)
-            with silhouette as context:
-                return silhouette.render(context)
-        register.simple_tag(tag, True, tag_name)
+        def compile_tag(parser, token):
+            bits = token.split_contents()
+            target_var = None
+            if len(bits) >= 4 and bits[-2] == 'as':
+                target_var = bits[-1]
+                bits = bits[:-2]
+            if len(bits) < 2:
+                raise TemplateSyntaxError("'{}' takes at least one argument".format(bits[0]))
+            remaining_bits = bits[2:]
+            kwargs = token_kwargs(remaining_bits, parser)
+            if remaining_bits:
+                raise TemplateSyntaxError("'{}' received an invalid argument: '{}'".format(bits[0], remaining_bits[0]))
+            return SilhouetteNode(silhouette_class, parser.compile_filter(bits[1]), kwargs, target_var)
+        register.tag(tag_name, compile_tag)
+        silhouette_classes[tag_name] = silhouette_class
         return silhouette_class
     return register_tag
 
 
+class StripWhitespaceNode(Node):
+
+    def __init__(self, nodelist):
+        self.nodelist = nodelist
+
+    def render(self, context):
+        return self.nodelist.render(context)
+
+
+@register.tag
+def stripwhitespace(parser, token):
+    """
+    Strip whitespace between html tags from the enclosed template text once, when the template is compiled. Unlike
+    spaceless, the output isn't processed each time it renders, and the output of enclosed tags isn't stripped.
+
+    """
+    nodelist = parser.parse(('endstripwhitespace',))
+    parser.delete_first_token()
+    return StripWhitespaceNode(whitespace.strip_nodelist(nodelist))
+
+
+def flatten_dicts(dicts, scope):
+    """
+    Merge the frames of a context stack and the variables of a tag into a single frame.
+
+    """
+    frame = {}
+    for d in dicts:
+        frame.update(d)
+    frame.update(scope)
+    return frame
+
+
 class BaseSilhouette(object):
     """
     Base class for Silhouette Renderers
@@ -42,22 +154,44 @@ class BaseSilhouette(object):
     PATH_CONTEXT_KEY = 'silhouette_path'
     THEME_CONTEXT_KEY = 'silhouette_theme'
 
-    def __init__(self, context, obj, template=None, theme=None, path=None, **kwargs):
+    #: Prefixes of keyword arguments nested under "<prefix>_attrs" and cascaded to inner tags
+    prefixes = ()
+
+    #: Prefix of the cascaded attributes merged with keyword arguments
+    cascade = None
+
+    #: Keyword arguments added to the context as variables rather than html attributes
+    variables = ()
+
+    #: Whether the output can be stored in the fragment cache, when the tag is called with cache=True
+    cacheable = False
+
+    def __init__(self, context, obj, template=None, theme=None, path=None, cache=False, **kwargs):
         self.context = context
         self.obj = obj
         self.path_override = path or context.get(self.PATH_CONTEXT_KEY, None)
         self.theme_override = theme or context.get(self.THEME_CONTEXT_KEY, None)
         self.template_override = template
+        self.cache = cache
         self.kwargs = kwargs
 
     def __enter__(self):
+        """
+        Render in a single frame merging the context and the variables of the tag, rather than pushing the variables
+        on top of the context, so that variables resolve in constant time however deeply tags are nested. Frames up
+        to the context processors frame of a RequestContext are kept, so that it can still be bound to a template
+        within the tag. The frames of the context are restored on exit.
+
+        """
         scope = {self.PATH_CONTEXT_KEY: self.path_override, self.THEME_CONTEXT_KEY: self.theme_override}
         scope.update(self.get_extra_context())
-        self.context.update(scope)
+        self.outer_dicts = dicts = self.context.dicts
+        kept = getattr(self.context, '_processors_index', -1) + 1
+        self.context.dicts = dicts[:kept] + [flatten_dicts(dicts[kept:], scope)]
         return self.context
 
     def __exit__(self, *args, **kwargs):
-        self.context.pop()
+        self.context.dicts = self.outer_dicts
 
     @property
     def template_type(self):
@@ -65,7 +199,7 @@ class BaseSilhouette(object):
         Template type to use when loading the tag template. It corresponds to a key in silhouette.settings.PATTERNS.
 
         """
-        return normalize(type(self).__name__)
+        return template_types[type(self)]
 
     @property
     def template(self):
@@ -77,42 +211,71 @@ class BaseSilhouette(object):
             return get_template(self.template_override)
         return get_silhouette(self.obj, self.template_type, path=self.path_override, theme=self.theme_override)
 
-    def merge_attrs(self, *holders):
+    def find_template(self):
         """
-        Merge html attributes from different holders. CSS classes are concatenated and all
-        other attributes are overridden with the rightmost holders taking precedence over
-        the leftmost holders.
+        Load the template like template does, but return None instead of raising TemplateDoesNotExist when it
+        doesn't exist. Missing templates are remembered by the loader so renderers can fall back without probing.
+
+        """
+        if self.template_override:
+            try:
+                return get_template(self.template_override)
+            except TemplateDoesNotExist:
+                return None
+        return get_silhouette.find_template(self.obj, self.template_type, path=self.path_override, theme=self.theme_override)
+
+    @classmethod
+    def merge_attrs(cls, *holders):
+        """
+        Merge html attributes from different holders. CSS classes are concatenated in order, without
+        duplicates, and all other attributes are overridden with the rightmost holders taking precedence
+        over the leftmost holders.
 
         """
         attrs = {}
         classes = []
         for holder in holders:
-            if 'class' in holder:
-                classes.append(holder['class'])
+            if holder.get('class') is not None:
+                classes.extend(css for css in holder['class'].split() if css not in classes)
             attrs.update({k: v for k, v in six.iteritems(holder) if v is not None})
-        if classes:
-            attrs['class'] = ' '.join(set(' '.join([cls.strip() for cls in classes if cls is not None]).split(' ')))
+        if 'class' in attrs:
+            attrs['class'] = ' '.join(classes)
         return attrs
 
-    def build_attrs(self, attrs, *prefixes):
+    @classmethod
+    def build_attrs(cls, attrs, *prefixes):
         """
         Nest html attributes by prefix. Non prefixed attributes fall under the default "attrs" key
 
         """
         if not prefixes:
             return {'attrs': attrs}
+        match = prefix_matcher(prefixes)
         split_attrs = {'attrs': {}}
         for key, value in six.iteritems(attrs):
-            match = re.match("^({})_".format("|".join(re.escape(p) for p in prefixes)), key)
-            if match:
-                parent_key, nested_key = "{}_attrs".format(key[:match.end() - 1]), key[match.end():]
-                if parent_key not in split_attrs:
-                    split_attrs[parent_key] = {}
-                split_attrs[parent_key][nested_key] = value
+            prefix = match(key)
+            if prefix:
+                split_attrs.setdefault("{}_attrs".format(prefix.group(1)), {})[key[prefix.end():]] = value
             else:
                 split_attrs['attrs'][key] = value
         return split_attrs
 
+    @classmethod
+    def compile_attrs(cls, kwargs):
+        """
+        Split keyword arguments into context variables and html attributes nested by prefix. The result only depends
+        on keyword arguments, so tags with literal arguments compile them once, when the template is compiled.
+
+        """
+        attrs = cls.merge_attrs(kwargs)
+        compiled = {name: attrs.pop(name, None) for name in cls.variables}
+        compiled.update(cls.build_attrs(attrs, *cls.prefixes))
+        return compiled
+
+    @cached_property
+    def compiled_attrs(self):
+        return self.compile_attrs(self.kwargs)
+
     def cascaded_attrs(self, prefix, context=None):
         """
         Retrieve cascaded attributes for prefix from context
@@ -121,12 +284,73 @@ class BaseSilhouette(object):
         context = context or self.context
         return context.get("{}_attrs".format(prefix), {})
 
+    def scoped_attrs(self):
+        """
+        Compiled attributes merged with the attributes cascaded by outer tags. Cascaded variables are
+        only used when they are not passed as keyword arguments.
+
+        """
+        if self.cascade is None:
+            return self.compiled_attrs
+        scoped = dict(self.compiled_attrs)
+        cascaded = dict(self.cascaded_attrs(self.cascade))
+        for name in self.variables:
+            value = cascaded.pop(name, None)
+            if scoped[name] is None:
+                scoped[name] = value
+        scoped['attrs'] = self.merge_attrs(cascaded, scoped['attrs'])
+        return scoped
+
+    def render_template(self, template, context):
+        """
+        Render template with the active context. Templates returned by Django's template backends are unwrapped
+        so that the Context is passed down as is. Templates of other engines (e.g. Jinja2) are rendered with the
+        flattened context, and contexts of other engines are converted for Django templates.
+
+        """
+        template = getattr(template, 'template', template)
+        if isinstance(template, Template):
+            if not isinstance(context, BaseContext):
+                context = Context(context.flatten(), autoescape=context.autoescape)
+            return template.render(context)
+        return mark_safe(template.render(context.flatten()))
+
     def render(self, context):
         """
         Render template using context
 
         """
-        return self.template.render(context)
+        return self.render_template(self.template, context)
+
+    def render_in_scope(self):
+        """
+        Render within the scope of the tag. Output of cacheable renderers is served from the fragment cache when
+        the tag is called with cache=True and the object is unbound.
+
+        """
+        if instrumentation.listeners:
+            return instrumentation.render(self, self._render_in_scope)
+        return self._render_in_scope()
+
+    def _render_in_scope(self):
+        if self.cache and self.cacheable and not self.is_bound():
+            return fragments.render_cached(self)
+        with self as context:
+            return self.render(context)
+
+    def is_bound(self):
+        """
+        Whether the rendered object holds data submitted by the user. Bound objects are never cached.
+
+        """
+        return True
+
+    def get_fragment_state(self):  # pragma: no cover
+        """
+        State of the rendered object that affects its output, included in the fragment cache key
+
+        """
+        raise NotImplementedError()
 
     def get_extra_context(self):  # pragma: no cover
         """
@@ -146,74 +370,61 @@ class BaseFormSilhouette(BaseSilhouette):
     def form(self):
         return self.obj
 
+    def is_bound(self):
+        return self.form.is_bound
+
+    def get_fragment_state(self):
+        return fragments.get_form_state(self.form)
+
     def get_extra_context(self):
-        return {'form': self.form}
+        ctx = {'form': self.form}
+        ctx.update(self.scoped_attrs())
+        return ctx
 
 
 @silhouette_tag("silhouette")
 class Form(BaseFormSilhouette):
-
-    def get_extra_context(self):
-        ctx = super(Form, self).get_extra_context()
-        ctx.update(self.build_attrs(self.kwargs, 'errors', 'media', 'controls', 'fields'))
-        return ctx
+    prefixes = ('errors', 'media', 'controls', 'fields')
+    cacheable = True
 
 
 @silhouette_tag("form_fields")
 class FormFields(BaseFormSilhouette):
-
-    def get_extra_context(self):
-        ctx = super(FormFields, self).get_extra_context()
-        ctx.update(self.build_attrs(self.merge_attrs(self.cascaded_attrs('fields'), self.kwargs)))
-        return ctx
+    cascade = 'fields'
 
 
 @silhouette_tag("form_errors")
 class FormErrors(BaseFormSilhouette):
-
-    def get_extra_context(self):
-        ctx = super(FormErrors, self).get_extra_context()
-        ctx.update(self.build_attrs(self.merge_attrs(self.cascaded_attrs('errors'), self.kwargs)))
-        return ctx
+    cascade = 'errors'
 
     def render(self, context):
-        try:
-            return super(FormErrors, self).render(context)
-        except TemplateDoesNotExist:
+        template = self.find_template()
+        if template is None:
             return force_text(self.form.non_field_errors())
+        return self.render_template(template, context)
 
 
 @silhouette_tag("form_controls")
 class FormControls(BaseFormSilhouette):
-
-    def get_extra_context(self):
-        ctx = super(FormControls, self).get_extra_context()
-        attrs = self.merge_attrs(self.cascaded_attrs('controls'), self.kwargs)
-        non_attrs = {'contents': attrs.pop('contents', None)}
-        ctx.update(non_attrs)
-        ctx.update(self.build_attrs(attrs))
-        return ctx
+    cascade = 'controls'
+    variables = ('contents',)
 
     def render(self, context):
-        try:
-            return super(FormControls, self).render(context)
-        except TemplateDoesNotExist:
+        template = self.find_template()
+        if template is None:
             return ""
+        return self.render_template(template, context)
 
 
 @silhouette_tag("form_media")
 class FormMedia(BaseFormSilhouette):
-
-    def get_extra_context(self):
-        ctx = super(FormMedia, self).get_extra_context()
-        ctx.update(self.build_attrs(self.merge_attrs(self.cascaded_attrs('media'), self.kwargs)))
-        return ctx
+    cascade = 'media'
 
     def render(self, context):
-        try:
-            return super(FormMedia, self).render(context)
-        except TemplateDoesNotExist:
+        template = self.find_template()
+        if template is None:
             return force_text(self.obj.media)
+        return self.render_template(template, context)
 
 
 class BaseFormsetSilhouette(BaseSilhouette):
@@ -226,26 +437,191 @@ class BaseFormsetSilhouette(BaseSilhouette):
     def formset(self):
         return self.obj
 
+    def is_bound(self):
+        return self.formset.is_bound
+
+    def get_fragment_state(self):
+        formset = self.formset
+        return (fragments.get_class_path(type(formset)), formset.prefix, formset.total_form_count(),
+                [fragments.get_form_state(form) for form in formset.forms], fragments.get_form_state(formset.empty_form))
+
     def get_extra_context(self):
-        return {'formset': self.formset}
+        ctx = {'formset': self.formset}
+        ctx.update(self.scoped_attrs())
+        return ctx
+
+
+#: Per-form blocks of formset templates before forms were rendered with the formset_form tag
+LEGACY_FORMSET_BLOCKS = frozenset(('errors', 'fields', 'controls', 'order', 'delete'))
+
+#: Base formset template, which renders legacy blocks when templates extending it override them
+BASE_FORMSET_TEMPLATE = "silhouette/base/formsets/formset.html"
+
+
+def get_legacy_blocks(template):
+    """
+    Names of the legacy per-form blocks overridden by a formset template or by the templates it extends, up to the
+    base formset template. Parents are followed when their names are literal strings.
+
+    """
+    template = getattr(template, 'template', template)
+    blocks = set()
+    while template is not None and getattr(template, 'name', None) != BASE_FORMSET_TEMPLATE:
+        nodelist = getattr(template, 'nodelist', None)
+        if nodelist is None:
+            break
+        blocks.update(node.name for node in nodelist.get_nodes_by_type(BlockNode) if node.name in LEGACY_FORMSET_BLOCKS)
+        extends = nodelist.get_nodes_by_type(ExtendsNode)
+        parent_name = extends[0].parent_name.var if extends else None
+        if not isinstance(parent_name, six.string_types):
+            break
+        parent = get_template(parent_name)
+        template = getattr(parent, 'template', parent)
+    return frozenset(blocks)
+
+legacy_blocks = Registry(get_legacy_blocks)
 
 
 @silhouette_tag("formset")
 class Formset(BaseFormsetSilhouette):
+    prefixes = ('errors', 'fields')
+    variables = ('window_start', 'window_size')
+    cacheable = True
+
+    #: Context variable rendered by formset templates in place of their forms when rendering in chunks
+    STREAM_CONTEXT_KEY = 'silhouette_stream'
+
+    #: Marker splitting the output of formset templates around their forms
+    STREAM_MARKER = mark_safe('<!--silhouette-stream-->')
+
+    #: Context variable telling the base formset template to render forms with the legacy per-form blocks, when
+    #: templates extending it override them. These forms are rendered in one chunk.
+    LEGACY_BLOCKS_CONTEXT_KEY = 'silhouette_legacy_blocks'
 
     def get_extra_context(self):
         ctx = super(Formset, self).get_extra_context()
-        ctx.update(self.build_attrs(self.kwargs, 'errors', 'fields'))
+        template = self.find_template()
+        ctx[self.LEGACY_BLOCKS_CONTEXT_KEY] = bool(template is not None and legacy_blocks[template])
+        start, stop = self.get_window(ctx['window_start'], ctx['window_size'])
+        if start is None:
+            ctx['subforms'] = self.formset.forms
+            ctx['hidden_subforms'] = ()
+        else:
+            ctx['subforms'] = self.get_window_forms(start, stop)
+            ctx['hidden_subforms'] = self.get_hidden_forms(start, stop)
         return ctx
 
+    def get_window(self, window_start, window_size):
+        """
+        Bounds of the forms rendered when the tag is called with window_start or window_size, or (None, None) to
+        render all forms. A window starting past the last form is empty, so that its forms are all rendered as hidden
+        inputs once.
+
+        """
+        if window_start is None and window_size is None:
+            return None, None
+        start, size = int(window_start or 0), None if window_size is None else int(window_size)
+        if start < 0 or (size is not None and size < 0):
+            raise ValueError("window_start and window_size must be positive, got {} and {}".format(start, size))
+        total = self.formset.total_form_count()
+        start = min(start, total)
+        return start, total if size is None else min(start + size, total)
+
+    def get_hidden_forms(self, start, stop):
+        """
+        Forms outside of the window, constructed when iterated, as windows rendered alone don't render them.
+
+        """
+        forms = self.formset.forms
+        for form in itertools.chain(forms[:start], forms[stop:]):
+            yield form
+
+    def get_window_forms(self, start, stop):
+        """
+        Forms of the window. Only forms of the window are constructed when the formset hasn't constructed its forms
+        yet, so that rendering a window costs the same whatever the size of the formset.
+
+        """
+        formset = self.formset
+        if 'forms' in formset.__dict__:
+            return formset.forms[start:stop]
+        get_form_kwargs = getattr(formset, 'get_form_kwargs', lambda i: {})
+        return [formset._construct_form(i, **get_form_kwargs(i)) for i in range(start, stop)]
+
+    def is_parallel(self, subforms):
+        threshold = conf.settings.PARALLEL_THRESHOLD
+        return (threshold is not None and len(subforms) >= threshold and parallel.is_enabled() and
+                not parallel.queries_database(self.formset, subforms))
+
+    def render(self, context):
+        if self.is_parallel(context['subforms']):
+            return mark_safe("".join(self.render_chunks(context)))
+        return super(Formset, self).render(context)
+
+    def render_chunks(self, context):
+        """
+        Render the formset template with a marker in place of its forms, and yield the output before the marker,
+        each form rendered with the formset_form tag, and the output after the marker. Templates overriding the
+        forms block are yielded in one chunk.
+
+        """
+        context.update({self.STREAM_CONTEXT_KEY: self.STREAM_MARKER})
+        try:
+            output = force_text(self.render_template(self.template, context))
+        finally:
+            context.pop()
+        head, marker, tail = output.partition(self.STREAM_MARKER)
+        yield head
+        if marker:
+            for chunk in self.render_subforms(context, context['subforms']):
+                yield chunk
+            yield tail
+
+    def render_subforms(self, context, subforms):
+        """
+        Render each form with the formset_form tag. Forms of formsets above SILHOUETTE_PARALLEL_THRESHOLD are
+        rendered on a thread pool, each with its own copy of the context, and yielded in order.
+
+        """
+        if self.is_parallel(subforms):
+            return parallel.imap(lambda subform: self.render_subform(copy.copy(context), subform), subforms)
+        return (self.render_subform(context, subform) for subform in subforms)
+
+    def render_subform(self, context, subform):
+        return force_text(FormsetForm(context, subform).render_in_scope())
+
 
 @silhouette_tag("formset_errors")
 class FormsetErrors(BaseFormsetSilhouette):
+    cascade = 'errors'
+
+
+@silhouette_tag("formset_form")
+class FormsetForm(BaseFormSilhouette):
+    pass
 
-    def get_extra_context(self):
-        ctx = super(FormsetErrors, self).get_extra_context()
-        ctx.update(self.build_attrs(self.merge_attrs(self.cascaded_attrs('errors'), self.kwargs)))
-        return ctx
+
+@silhouette_tag("formset_empty_form")
+class FormsetEmptyForm(FormsetForm):
+    """
+    Renders the empty form of a formset with the formset_form template. The output is stored in the fragment cache
+    unless the tag is called with cache=False, so that it's only rendered once per formset class and arguments.
+
+    """
+    template_type = 'formset_form'
+    cacheable = True
+
+    def __init__(self, context, formset, **kwargs):
+        kwargs.setdefault('cache', True)
+        super(FormsetEmptyForm, self).__init__(context, formset.empty_form, **kwargs)
+        self.formset = formset
+
+    def is_bound(self):
+        return False
+
+    def get_fragment_state(self):
+        return (fragments.get_class_path(type(self.formset)), fragments.get_form_state(self.form),
+                [fragments.freeze(self.cascaded_attrs(prefix)) for prefix in Formset.prefixes])
 
 
 class BaseFieldSilhouette(BaseSilhouette):
@@ -258,114 +634,109 @@ class BaseFieldSilhouette(BaseSilhouette):
     def bound_field(self):
         return self.obj
 
-    def get_extra_context(self):
-        return {'field': self.bound_field}
+    def is_bound(self):
+        return self.bound_field.form.is_bound
 
-    def __enter__(self):
-        context = super(BaseFieldSilhouette, self).__enter__()
-        self.widget_original_attrs = self.bound_field.field.widget.attrs
-        self.bound_field.field.widget.attrs = self.get_widget_attrs_for_scope(context)
-        return context
+    def get_fragment_state(self):
+        form = self.bound_field.form
+        return (fragments.get_class_path(type(form)), self.bound_field.name, form.prefix, form.auto_id,
+                form.label_suffix, fragments.freeze(form.initial), fragments.get_field_state(self.bound_field.field))
 
-    def __exit__(self, *args, **kwargs):
-        self.bound_field.field.widget.attrs = self.widget_original_attrs
-        super(BaseFieldSilhouette, self).__exit__(*args, **kwargs)
+    def get_extra_context(self):
+        ctx = dict(self.scoped_attrs())
+        ctx['field'] = self.get_scoped_field(self.get_widget_attrs_for_scope(ctx))
+        ctx['widget_kind'] = get_widget_kind(self.bound_field.field.widget)
+        return ctx
+
+    def get_scoped_field(self, widget_attrs):
+        """
+        Bound field rendering its widget with widget_attrs. The field and widget are copied rather than modified, so
+        that form instances can be rendered concurrently. The bound field is returned as is when attributes match.
 
-    def get_widget_attrs_for_scope(self, context):  # pragma: nocover
+        """
+        bound_field = self.bound_field
+        widget = bound_field.field.widget
+        if widget_attrs == widget.attrs:
+            return bound_field
+        scoped_widget = copy.copy(widget)
+        scoped_widget.attrs = widget_attrs
+        scoped_field = copy.copy(bound_field.field)
+        scoped_field.widget = scoped_widget
+        scoped_bound_field = copy.copy(bound_field)
+        scoped_bound_field.field = scoped_field
+        return scoped_bound_field
+
+    def get_widget_attrs_for_scope(self, scope):
         """
         Widget attributes for the current scope, as some widget attributes affect attributes of other elements (e.g. label "for" uses the widget's id).
 
         """
-        raise NotImplementedError()
+        return self.bound_field.field.widget.attrs
 
 
 @silhouette_tag("field")
 class Field(BaseFieldSilhouette):
+    prefixes = ('label', 'widget', 'errors', 'help_text')
+    cacheable = True
 
-    def get_widget_attrs_for_scope(self, context):
-        return self.merge_attrs(self.bound_field.field.widget.attrs, self.cascaded_attrs('widget', context))
-
-    def get_extra_context(self):
-        ctx = super(Field, self).get_extra_context()
-        ctx.update(self.build_attrs(self.merge_attrs(self.kwargs), 'label', 'widget', 'errors', 'help_text'))
-        return ctx
+    def get_widget_attrs_for_scope(self, scope):
+        return self.merge_attrs(self.bound_field.field.widget.attrs, scope.get('widget_attrs', self.cascaded_attrs('widget')))
 
 
 @silhouette_tag("field_widget")
 class FieldWidget(BaseFieldSilhouette):
+    cascade = 'widget'
 
-    def get_widget_attrs_for_scope(self, context):
-        return context.get('attrs', {})
+    def get_widget_attrs_for_scope(self, scope):
+        return scope['attrs']
 
-    def get_extra_context(self):
-        ctx = super(FieldWidget, self).get_extra_context()
-        ctx.update(self.build_attrs(self.merge_attrs(self.bound_field.field.widget.attrs, self.cascaded_attrs('widget'), self.kwargs)))
-        return ctx
+    def scoped_attrs(self):
+        scoped = dict(super(FieldWidget, self).scoped_attrs())
+        scoped['attrs'] = self.merge_attrs(self.bound_field.field.widget.attrs, scoped['attrs'])
+        return scoped
 
     def render(self, context):
-        try:
-            return super(FieldWidget, self).render(context)
-        except TemplateDoesNotExist:
-            return self.bound_field.as_widget()
+        template = self.find_template()
+        if template is None:
+            return context['field'].as_widget()
+        return self.render_template(template, context)
 
 
 @silhouette_tag("field_label")
 class FieldLabel(BaseFieldSilhouette):
+    cascade = 'label'
+    variables = ('contents', 'suffix')
 
-    def get_widget_attrs_for_scope(self, context):
-        return self.merge_attrs(self.bound_field.field.widget.attrs, {'id': context.get('attrs', {}).get('for', None)})
-
-    def get_extra_context(self):
-        ctx = super(FieldLabel, self).get_extra_context()
-        attrs = self.merge_attrs(self.cascaded_attrs('label'), self.kwargs)
-        non_attrs = {'contents': attrs.pop('contents', None), 'suffix': attrs.pop('suffix', None)}
-        ctx.update(non_attrs)
-        ctx.update(self.build_attrs(attrs))
-        return ctx
+    def get_widget_attrs_for_scope(self, scope):
+        return self.merge_attrs(self.bound_field.field.widget.attrs, {'id': scope['attrs'].get('for', None)})
 
     def render(self, context):
-        try:
-            return super(FieldLabel, self).render(context)
-        except TemplateDoesNotExist:
-            return self.bound_field.label_tag(contents=context.get('contents'),
-                                              attrs=context.get('attrs'),
-                                              label_suffix=context.get('suffix'))
+        template = self.find_template()
+        if template is None:
+            return context['field'].label_tag(contents=context.get('contents'),
+                                             attrs=context.get('attrs'),
+                                             label_suffix=context.get('suffix'))
+        return self.render_template(template, context)
 
 
 @silhouette_tag("field_help_text")
 class FieldHelpText(BaseFieldSilhouette):
-
-    def get_widget_attrs_for_scope(self, context):
-        return self.bound_field.field.widget.attrs
-
-    def get_extra_context(self):
-        ctx = super(FieldHelpText, self).get_extra_context()
-        attrs = self.merge_attrs(self.cascaded_attrs('help_text'), self.kwargs)
-        non_attrs = {'contents': attrs.pop('contents', None)}
-        ctx.update(non_attrs)
-        ctx.update(self.build_attrs(attrs))
-        return ctx
+    cascade = 'help_text'
+    variables = ('contents',)
 
     def render(self, context):
-        try:
-            return super(FieldHelpText, self).render(context)
-        except TemplateDoesNotExist:
+        template = self.find_template()
+        if template is None:
             return context.get('contents') or self.bound_field.help_text
+        return self.render_template(template, context)
 
 
 @silhouette_tag("field_errors")
 class FieldErrors(BaseFieldSilhouette):
-
-    def get_widget_attrs_for_scope(self, context):
-        return self.bound_field.field.widget.attrs
-
-    def get_extra_context(self):
-        ctx = super(FieldErrors, self).get_extra_context()
-        ctx.update(self.build_attrs(self.merge_attrs(self.cascaded_attrs('errors'), self.kwargs)))
-        return ctx
+    cascade = 'errors'
 
     def render(self, context):
-        try:
-            return super(FieldErrors, self).render(context)
-        except TemplateDoesNotExist:
+        template = self.find_template()
+        if template is None:
             return force_text(self.bound_field.errors)
+        return self.render_template(template, context)
@@ -0,0 +1,125 @@
+"""
+Test helpers asserting how much work rendering forms takes, e.g. to catch performance regressions of themes::
+
+    class ThemeTestCase(SilhouetteTestMixin, SimpleTestCase):
+
+        def test_contact_form(self):
+            with self.assertSilhouetteBudget(max_renders=20, max_lookups=20, max_fallbacks=0):
+                template.render(context)
+
+"""
+from __future__ import unicode_literals
+
+import threading
+
+from . import instrumentation
+from .templatetags.silhouette_tags import silhouette_classes
+
+
+def get_tag_name(silhouette):
+    for tag_name, silhouette_class in silhouette_classes.items():
+        if silhouette_class is type(silhouette):
+            return tag_name
+    return type(silhouette).__name__
+
+
+class Usage(object):
+
+    def __init__(self):
+        self.renders = 0
+        self.lookups = 0
+        self.fallbacks = 0
+
+
+class SilhouetteBudget(instrumentation.Listener):
+    """
+    Context manager counting tag renders, template lookups and fallbacks (lookups for which no template exists) of
+    every thread inside a block, and failing when they exceed their maximum. Maximums left to None are not checked.
+
+    """
+    LIMITS = (('renders', 'max_renders'), ('lookups', 'max_lookups'), ('fallbacks', 'max_fallbacks'))
+
+    def __init__(self, max_lookups=None, max_renders=None, max_fallbacks=None, test_case=None):
+        self.max_lookups = max_lookups
+        self.max_renders = max_renders
+        self.max_fallbacks = max_fallbacks
+        self.test_case = test_case
+        self.tags = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def __enter__(self):
+        instrumentation.add_listener(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        instrumentation.remove_listener(self)
+        if exc_type is None:
+            self.check()
+
+    @property
+    def renders(self):
+        return sum(usage.renders for usage in self.tags.values())
+
+    @property
+    def lookups(self):
+        return sum(usage.lookups for usage in self.tags.values())
+
+    @property
+    def fallbacks(self):
+        return sum(usage.fallbacks for usage in self.tags.values())
+
+    def get_usage(self, tag_name):
+        try:
+            return self.tags[tag_name]
+        except KeyError:
+            return self.tags.setdefault(tag_name, Usage())
+
+    def render_started(self, silhouette):
+        tag_name = get_tag_name(silhouette)
+        self.local.stack = getattr(self.local, 'stack', []) + [tag_name]
+        with self.lock:
+            self.get_usage(tag_name).renders += 1
+
+    def render_finished(self, silhouette, elapsed):
+        self.local.stack = getattr(self.local, 'stack', [])[:-1]
+
+    def template_resolved(self, obj, template_type, theme, template_names, template, hit, elapsed):
+        stack = getattr(self.local, 'stack', None)
+        tag_name = stack[-1] if stack else template_type
+        with self.lock:
+            usage = self.get_usage(tag_name)
+            usage.lookups += 1
+            if template is None:
+                usage.fallbacks += 1
+
+    def check(self):
+        exceeded = ["{} {} (max {})".format(getattr(self, name), name, getattr(self, limit))
+                    for name, limit in self.LIMITS
+                    if getattr(self, limit) is not None and getattr(self, name) > getattr(self, limit)]
+        if exceeded:
+            message = "Silhouette budget exceeded: {}\n{}".format(", ".join(exceeded), "\n".join(self.breakdown()))
+            if self.test_case is not None:
+                self.test_case.fail(message)
+            raise AssertionError(message)
+
+    def breakdown(self):
+        """
+        Lines of a table of the renders, lookups and fallbacks of each tag, by decreasing number of renders.
+
+        """
+        lines = ["{:<24} {:>8} {:>8} {:>9}".format("tag", "renders", "lookups", "fallbacks")]
+        for tag_name, usage in sorted(self.tags.items(), key=lambda item: (-item[1].renders, item[0])):
+            lines.append("{:<24} {:>8} {:>8} {:>9}".format(tag_name, usage.renders, usage.lookups, usage.fallbacks))
+        return lines
+
+
+class SilhouetteTestMixin(object):
+    """
+    Mixin for test cases adding assertSilhouetteBudget, like assertNumQueries but for form rendering.
+
+    """
+
+    def assertSilhouetteBudget(self, max_lookups=None, max_renders=None, max_fallbacks=None):
+        return SilhouetteBudget(max_lookups=max_lookups, max_renders=max_renders, max_fallbacks=max_fallbacks,
+                                test_case=self)
@@ -1,5 +1,88 @@
 import re
+import threading
+import weakref
+from collections import OrderedDict
 
 
 def normalize(name):
     return re.sub('(((?<=[a-z])[A-Z1-9])|([A-Z1-9](?![A-Z1-9]|$)))', '_\\1', name).strip('_').lower()
+
+
+_prefix_matchers = {}
+
+
+def prefix_matcher(prefixes):
+    """
+    Return a match function for keys starting with one of prefixes followed by an underscore. Patterns are compiled
+    once per tuple of prefixes.
+
+    """
+    try:
+        return _prefix_matchers[prefixes]
+    except KeyError:
+        matcher = _prefix_matchers[prefixes] = re.compile("^({})_".format("|".join(re.escape(p) for p in prefixes))).match
+        return matcher
+
+
+class LRUCache(object):
+    """
+    Thread-safe mapping bounded to maxsize entries, evicting the least recently used entries first.
+    A maxsize of None leaves the mapping unbounded, and a maxsize of 0 disables caching altogether.
+
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return default
+            self._data[key] = value
+            return value
+
+    def set(self, key, value):
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while self.maxsize is not None and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class Registry(object):
+    """
+    Thread-safe mapping of values computed lazily by factory, once per key. Keys are held weakly,
+    so that entries for classes created at runtime (e.g. with formset_factory) don't outlive their class.
+
+    """
+    def __init__(self, factory):
+        self.factory = factory
+        self._data = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, key):
+        try:
+            return self._data[key]
+        except KeyError:
+            with self._lock:
+                if key not in self._data:
+                    self._data[key] = self.factory(key)
+                return self._data[key]
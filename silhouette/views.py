@@ -0,0 +1,39 @@
+from django.http import HttpResponse
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_response_headers, patch_vary_headers
+from django.views.generic import View
+
+from . import conf
+from .formsets import render_formset_empty_form
+
+
+class FormsetEmptyFormView(View):
+    """
+    Serve the empty form of formset_class, rendered with the formset_form template and cached, for scripts adding forms
+    to a formset. Responses are cacheable by browsers and proxies for cache_timeout seconds, and vary on the
+    language of the request when USE_I18N is on.
+
+    """
+    formset_class = None
+    prefix = None
+    template = None
+    theme = None
+    path = None
+    attrs = {}
+    cache_timeout = None
+
+    def get_formset(self):
+        return self.formset_class(prefix=self.prefix)
+
+    def get_cache_timeout(self):
+        return conf.settings.FRAGMENT_CACHE_TIMEOUT if self.cache_timeout is None else self.cache_timeout
+
+    def get(self, request, *args, **kwargs):
+        html = render_formset_empty_form(self.get_formset(), template=self.template, theme=self.theme, path=self.path,
+                                         **self.attrs)
+        response = HttpResponse(html)
+        patch_response_headers(response, self.get_cache_timeout())
+        patch_cache_control(response, public=True)
+        if settings.USE_I18N:
+            patch_vary_headers(response, ('Accept-Language', 'Cookie'))
+        return response
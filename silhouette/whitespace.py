@@ -0,0 +1,69 @@
+"""
+Strip whitespace between html tags from compiled templates, once when templates are compiled or loaded, rather than
+from their output each time they render like {% spaceless %} does.
+
+Only the text of templates is stripped: whitespace around template tags and variables is removed when it contains a
+line break and sits next to an html tag, and whitespace between html tags is removed altogether. Output of variables
+and tags is left as is.
+
+Templates are stripped with the {% stripwhitespace %} tag, or altogether by loading them with Loader, which wraps
+Django's cached loader.
+
+"""
+import re
+
+from django.template.base import TextNode
+from django.template.loaders import cached
+
+between_tags_re = re.compile(r'>\s+<')
+
+leading_re = re.compile(r'^\s*\n\s*(?=<|$)')
+
+trailing_re = re.compile(r'(?<=>)\s*\n\s*$')
+
+
+def strip_text(text):
+    """
+    Strip whitespace from text found between template tags or variables.
+
+    """
+    text = between_tags_re.sub('><', text)
+    text = leading_re.sub('', text)
+    return trailing_re.sub('', text)
+
+
+def strip_nodelist(nodelist):
+    """
+    Strip the text nodes of nodelist and of its nested nodelists (e.g. blocks, loops and conditions).
+
+    """
+    for node in nodelist.get_nodes_by_type(TextNode):
+        node.s = strip_text(node.s)
+    return nodelist
+
+
+def strip_template(template):
+    """
+    Strip the text of a Django template once, returning the template. Templates of other engines are returned as is.
+
+    """
+    compiled = getattr(template, 'template', template)
+    nodelist = getattr(compiled, 'nodelist', None)
+    if nodelist is not None and not getattr(compiled, 'whitespace_stripped', False):
+        strip_nodelist(nodelist)
+        compiled.whitespace_stripped = True
+    return template
+
+
+class Loader(cached.Loader):
+    """
+    Cached template loader stripping the templates it compiles, before they are cached. Templates extended or included
+    by other templates are loaded through the engine's loaders, so they are stripped too.
+
+    """
+    def get_template(self, *args, **kwargs):
+        return strip_template(super(Loader, self).get_template(*args, **kwargs))
+
+    def load_template(self, *args, **kwargs):
+        template, origin = super(Loader, self).load_template(*args, **kwargs)
+        return strip_template(template), origin
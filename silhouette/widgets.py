@@ -0,0 +1,62 @@
+from django.forms import widgets
+from django.forms.extras import widgets as extra_widgets
+
+from .utils import normalize
+
+
+#: Kinds of the widgets known to Silhouette, by widget class
+WIDGET_KINDS = {
+    widgets.TextInput: 'text_input',
+    widgets.NumberInput: 'number_input',
+    widgets.EmailInput: 'email_input',
+    widgets.URLInput: 'url_input',
+    widgets.PasswordInput: 'password_input',
+    widgets.HiddenInput: 'hidden_input',
+    widgets.MultipleHiddenInput: 'multiple_hidden_input',
+    widgets.FileInput: 'file_input',
+    widgets.ClearableFileInput: 'clearable_file_input',
+    widgets.DateInput: 'date_input',
+    widgets.DateTimeInput: 'datetime_input',
+    widgets.TimeInput: 'time_input',
+    widgets.SplitDateTimeWidget: 'split_datetime_widget',
+    widgets.Textarea: 'textarea',
+    widgets.CheckboxInput: 'checkbox_input',
+    widgets.Select: 'select',
+    widgets.NullBooleanSelect: 'null_boolean_select',
+    widgets.SelectMultiple: 'select_multiple',
+    widgets.RadioSelect: 'radio_select',
+    widgets.CheckboxSelectMultiple: 'checkbox_select_multiple',
+    extra_widgets.SelectDateWidget: 'select_date_widget',
+}
+
+
+#: Kind and kinds of widget classes, computed on first use. Unlike Registry, a plain dict keeps lookups as cheap as
+#: isinstance
+widget_kinds = {}
+
+
+def get_widget_kinds(widget_class):
+    """
+    Kind of widget_class, and the kinds of the known widget classes found in its MRO, from the most specific. The
+    kind of widget classes that don't derive from known widget classes is their normalized name.
+
+    """
+    try:
+        return widget_kinds[widget_class]
+    except KeyError:
+        kinds = tuple(WIDGET_KINDS[cls] for cls in widget_class.__mro__ if cls in WIDGET_KINDS)
+        kind = kinds[0] if kinds else normalize(widget_class.__name__)
+        widget_kinds[widget_class] = kind, kinds
+        return kind, kinds
+
+
+def get_widget_kind(widget):
+    """
+    Kind of the most specific known widget class widget derives from (e.g. "text_input" for a subclass of TextInput)
+
+    """
+    return get_widget_kinds(type(widget))[0]
+
+
+def is_widget_kind(widget, kind):
+    return kind in get_widget_kinds(type(widget))[1]
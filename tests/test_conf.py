@@ -0,0 +1,86 @@
+from __future__ import unicode_literals
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from silhouette import conf
+from silhouette.apps import Silhouette
+from silhouette.loaders import loader
+
+
+class TestCompilePattern(SimpleTestCase):
+
+    def test_pattern_is_compiled(self):
+        format_pattern = conf.compile_pattern("{path}/{theme}/{form}.html")
+        self.assertEqual("silhouette/bootstrap/login_form.html",
+                         format_pattern({'path': "silhouette", 'theme': "bootstrap", 'form': "login_form"}))
+
+    def test_pattern_without_substitutions(self):
+        self.assertEqual("silhouette/form.html", conf.compile_pattern("silhouette/form.html")({'path': "other"}))
+
+    def test_pattern_with_percent_sign(self):
+        self.assertEqual("100%/login_form.html", conf.compile_pattern("100%/{form}.html")({'form': "login_form"}))
+
+    def test_pattern_with_format_spec(self):
+        self.assertEqual("form-007.html", conf.compile_pattern("form-{form:0>3}.html")({'form': "7"}))
+
+    def test_unknown_substitution(self):
+        with self.assertRaisesRegexp(ImproperlyConfigured, "unknown substitutions: model"):
+            conf.compile_pattern("{path}/{model}.html")
+
+    def test_invalid_pattern(self):
+        with self.assertRaises(ImproperlyConfigured):
+            conf.compile_pattern("{path/form.html")
+
+    def test_compiled_patterns_are_kept(self):
+        format_pattern = conf.compile_pattern("{path}.html")
+        self.assertEqual((format_pattern,), conf.compile_patterns([format_pattern]))
+
+
+class TestSettings(SimpleTestCase):
+
+    def get_values(self, **values):
+        defaults = {name: getattr(conf.settings, name) for name in dir(conf.settings) if name.isupper()}
+        defaults.update(values)
+        return defaults
+
+    def test_settings_are_read_only(self):
+        with self.assertRaises(AttributeError):
+            conf.settings.THEME = "other"
+        with self.assertRaises(AttributeError):
+            del conf.settings.THEME
+
+    def test_patterns_are_compiled(self):
+        self.assertTrue(all(callable(pattern) for patterns in conf.settings.PATTERNS.values() for pattern in patterns))
+
+    def test_settings_are_reloaded_when_changed(self):
+        theme = conf.settings.THEME
+        with override_settings(SILHOUETTE_THEME="other", SILHOUETTE_CACHE_SIZE=7):
+            self.assertEqual("other", conf.settings.THEME)
+            self.assertEqual("other", Silhouette.THEME)
+            self.assertEqual(7, loader.cache.maxsize)
+        self.assertEqual(theme, conf.settings.THEME)
+        self.assertEqual(theme, Silhouette.THEME)
+        self.assertEqual(conf.settings.CACHE_SIZE, loader.cache.maxsize)
+
+    def test_settings_dict(self):
+        with override_settings(SILHOUETTE={'THEME': "other"}):
+            self.assertEqual("other", conf.settings.THEME)
+            self.assertEqual("other", Silhouette.THEME)
+
+    def test_loader_reloads_settings(self):
+        # The loader doesn't depend on conf being notified first
+        stale = conf.settings
+        with override_settings(SILHOUETTE_CACHE_SIZE=7):
+            conf.settings = stale
+            loader.setting_changed(setting='SILHOUETTE_CACHE_SIZE')
+            self.assertEqual(7, conf.settings.CACHE_SIZE)
+            self.assertEqual(7, loader.cache.maxsize)
+
+    def test_invalid_settings(self):
+        conf.validate(self.get_values())
+        for values in ({'THEME': ""}, {'PATH': None}, {'CACHE_SIZE': -1}, {'PARALLEL_WORKERS': "4"},
+                       {'PARALLEL_THRESHOLD': 0}, {'PATTERNS': []}, {'PATTERNS': {'form': "{path}.html"}}):
+            with self.assertRaises(ImproperlyConfigured):
+                conf.validate(self.get_values(**values))
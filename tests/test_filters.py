@@ -1,7 +1,11 @@
 import unittest
 
 from collections import OrderedDict
+from django.test.utils import override_settings
+from django.forms import widgets
+from silhouette import html
 from silhouette.templatetags import silhouette_filters
+from silhouette.widgets import get_widget_kind, get_widget_kinds, is_widget_kind, widget_kinds
 from tests.mock.forms import MockForm
 
 
@@ -28,6 +32,30 @@ class TestWidgetFilters(unittest.TestCase):
         self.assertAllTrue(fields, test_func)
         self.assertAllFalse(set(self.form.fields) - set(fields), test_func)
 
+    def test_widget_kind(self):
+        self.assertEqual('text_input', silhouette_filters.widget_kind(self.form['text_input']))
+        self.assertEqual('email_input', silhouette_filters.widget_kind(self.form['email_input']))
+        self.assertEqual('clearable_file_input', silhouette_filters.widget_kind(self.form['clearable_file_input']))
+        self.assertEqual('checkbox_select_multiple', silhouette_filters.widget_kind(self.form['checkbox_select_multiple']))
+        self.assertEqual('select_date_widget', silhouette_filters.widget_kind(self.form['select_date_widget']))
+
+    def test_widget_kind_of_subclasses(self):
+        class CustomEmailInput(widgets.EmailInput):
+            pass
+
+        class CustomWidget(widgets.Widget):
+            pass
+
+        self.assertEqual('email_input', get_widget_kind(CustomEmailInput()))
+        self.assertTrue(is_widget_kind(CustomEmailInput(), 'text_input'))
+        self.assertEqual('custom_widget', get_widget_kind(CustomWidget()))
+        self.assertFalse(is_widget_kind(CustomWidget(), 'text_input'))
+
+    def test_widget_kinds_are_computed_once_per_class(self):
+        silhouette_filters.is_select(self.form['select'])
+        self.assertIn(widgets.Select, widget_kinds)
+        self.assertEqual(('select_multiple', ('select_multiple', 'select')), get_widget_kinds(widgets.SelectMultiple))
+
     def test_is_text_input(self):
         self.assertWidgetFilterTruth(silhouette_filters.is_text_input, {'text_input', 'email_input', 'url_input', 'number_input', 'password_input', 'date_input', 'datetime_input', 'time_input'})
 
@@ -97,3 +125,47 @@ class TestFilters(unittest.TestCase):
     def test_to_html_attrs(self):
         self.assertEqual(' id="my-id" class="my-class my-other-class"', silhouette_filters.to_html_attrs(OrderedDict((('id', 'my-id'), ('class', 'my-class my-other-class')))))
 
+    @override_settings(SILHOUETTE_CANONICAL_ATTRS=True)
+    def test_to_html_attrs_canonical(self):
+        self.assertEqual(' class="my-class" id="my-id"', silhouette_filters.to_html_attrs(OrderedDict((('id', 'my-id'), ('class', 'my-class')))))
+
+    def test_to_html_attrs_escapes_values(self):
+        self.assertEqual(' title="&lt;b&gt; &quot;quoted&quot;"', silhouette_filters.to_html_attrs({'title': '<b> "quoted"'}))
+
+    def test_to_html_attrs_boolean_and_none(self):
+        attrs = OrderedDict((('required', True), ('disabled', False), ('id', None), ('maxlength', 10)))
+        self.assertEqual(' required maxlength="10"', silhouette_filters.to_html_attrs(attrs))
+
+
+class TestAttrsCache(unittest.TestCase):
+
+    def setUp(self):
+        html.attrs_cache.clear()
+
+    def tearDown(self):
+        html.attrs_cache.clear()
+
+    def test_output_is_cached(self):
+        output = html.flatatt({'class': 'form-control'})
+        self.assertIs(output, html.flatatt({'class': 'form-control'}))
+        self.assertEqual(1, len(html.attrs_cache))
+
+    def test_only_string_values_are_cached(self):
+        self.assertEqual(' value="1"', html.flatatt({'value': 1}))
+        self.assertEqual(' value', html.flatatt({'value': True}))
+        self.assertEqual(0, len(html.attrs_cache))
+
+    def test_unhashable_values_are_not_cached(self):
+        self.assertEqual(' data-values="[1, 2]"', html.flatatt({'data-values': [1, 2]}))
+        self.assertEqual(0, len(html.attrs_cache))
+
+    @override_settings(SILHOUETTE_ATTRS_CACHE_SIZE=2)
+    def test_cache_is_bounded(self):
+        for i in range(5):
+            html.flatatt({'id': 'id-{}'.format(i)})
+        self.assertLessEqual(len(html.attrs_cache), 2)
+
+    @override_settings(SILHOUETTE_ATTRS_CACHE_SIZE=0)
+    def test_cache_can_be_disabled(self):
+        html.flatatt({'id': 'id'})
+        self.assertEqual(0, len(html.attrs_cache))
@@ -0,0 +1,165 @@
+from __future__ import unicode_literals
+
+from django.core.cache import caches
+from django.http import HttpRequest
+from django.test import SimpleTestCase
+from django.template.context import Context
+from django.test.utils import override_settings
+try:
+    from django.template.loader import get_template_from_string
+except ImportError:
+    from django.template import engines
+    get_template_from_string = engines['django'].from_string
+
+
+from .mock.forms import MockFormSet
+
+import silhouette
+from silhouette.views import FormsetEmptyFormView
+
+
+class TestFormsetWindow(SimpleTestCase):
+
+    def setUp(self):
+        self.formset = MockFormSet(data={'form-TOTAL_FORMS': '4',
+                                         'form-INITIAL_FORMS': '0',
+                                         'form-MAX_NUM_FORMS': '',
+                                         'form-0-field1': 'zero',
+                                         'form-1-field1': 'one',
+                                         'form-2-field1': 'two',
+                                         'form-3-field1': 'three'})
+
+    def tearDown(self):
+        self.formset = None
+
+    def render(self, source):
+        return get_template_from_string("{% load silhouette_tags %}" + source).render(Context({"formset": self.formset}))
+
+    def test_window(self):
+        result = self.render("{% formset formset window_start=1 window_size=2 %}")
+        self.assertIn('name="form-TOTAL_FORMS" type="hidden" value="4"', result)
+        self.assertIn('<input id="id_form-1-field1" name="form-1-field1" type="text" value="one" />', result)
+        self.assertIn('<input id="id_form-2-field1" name="form-2-field1" type="text" value="two" />', result)
+        self.assertIn('<input id="id_form-0-field1" name="form-0-field1" type="hidden" value="zero" />', result)
+        self.assertIn('<input id="id_form-3-field1" name="form-3-field1" type="hidden" value="three" />', result)
+        self.assertNotIn('for="id_form-0-field1"', result)
+
+    def test_window_size_only(self):
+        result = self.render("{% formset formset window_size=1 %}")
+        self.assertIn('name="form-0-field1" type="text"', result)
+        self.assertIn('name="form-1-field1" type="hidden"', result)
+
+    def test_window_start_only(self):
+        result = self.render("{% formset formset window_start=3 %}")
+        self.assertIn('name="form-0-field1" type="hidden"', result)
+        self.assertIn('name="form-3-field1" type="text"', result)
+
+    def test_window_past_last_form(self):
+        result = self.render("{% formset formset window_start=6 window_size=2 %}")
+        self.assertEqual(result.count('name="form-0-field1"'), 1)
+        self.assertEqual(result.count('name="form-3-field1" type="hidden"'), 1)
+        self.assertNotIn('type="text"', result)
+
+    def test_negative_window_size(self):
+        with self.assertRaises(ValueError):
+            self.render("{% formset formset window_start=2 window_size=-1 %}")
+
+    def test_negative_window_start(self):
+        with self.assertRaises(ValueError):
+            silhouette.render_formset_window(self.formset, -1, 2)
+
+    def test_without_window(self):
+        self.assertNotIn('type="hidden" value="zero"', self.render("{% formset formset %}"))
+
+    def test_render_formset_window(self):
+        result = silhouette.render_formset_window(self.formset, 2, 5, fields_class="window")
+        self.assertNotIn("form-TOTAL_FORMS", result)
+        self.assertNotIn("form-1-field1", result)
+        self.assertIn('name="form-2-field1" type="text"', result)
+        self.assertIn('name="form-3-field1" type="text"', result)
+        self.assertNotIn("forms", self.formset.__dict__)
+
+
+class TestFormsetLegacyBlocks(SimpleTestCase):
+
+    def setUp(self):
+        self.formset = MockFormSet()
+
+    def tearDown(self):
+        self.formset = None
+
+    def render(self, source):
+        return get_template_from_string("{% load silhouette_tags %}" + source).render(Context({"formset": self.formset}))
+
+    def test_legacy_blocks_are_rendered(self):
+        result = self.render("{% formset formset template='test_formsets/legacy_formset.html' %}")
+        self.assertIn("<p>legacy form-0</p>", result)
+        self.assertNotIn('name="form-0-field1"', result)
+
+    def test_legacy_blocks_of_parent_templates_are_rendered(self):
+        result = self.render("{% formset formset template='test_formsets/legacy_formset_child.html' %}")
+        self.assertIn("<p>legacy form-0</p>", result)
+        self.assertNotIn("TOTAL_FORMS", result)
+
+    def test_legacy_blocks_are_streamed_in_one_chunk(self):
+        chunks = list(silhouette.stream_formset(self.formset, template='test_formsets/legacy_formset.html'))
+        self.assertEqual(1, len(chunks))
+        self.assertIn("<p>legacy form-0</p>", chunks[0])
+
+    def test_base_template_renders_formset_form(self):
+        self.assertIn('name="form-0-field1"', self.render("{% formset formset %}"))
+
+
+class TestFormsetEmptyForm(SimpleTestCase):
+
+    def setUp(self):
+        self.cache = caches['default']
+        self.cache.clear()
+        self.formset = MockFormSet()
+
+    def tearDown(self):
+        self.formset = None
+        self.cache.clear()
+
+    def render(self, source, **context):
+        context['formset'] = self.formset
+        return get_template_from_string("{% load silhouette_tags %}" + source).render(Context(context))
+
+    def test_empty_form(self):
+        result = self.render("{% formset_empty_form formset %}")
+        self.assertIn('<input id="id_form-__prefix__-field1" name="form-__prefix__-field1" type="text" />', result)
+
+    def test_empty_form_is_cached(self):
+        self.render("{% formset_empty_form formset %}")
+        self.assertEqual(1, len(self.cache._cache))
+        self.cache.set(list(self.cache._cache)[0].split(":")[-1], "cached")
+        self.assertEqual("cached", self.render("{% formset_empty_form formset %}"))
+        self.assertEqual("cached", silhouette.render_formset_empty_form(MockFormSet()))
+        self.assertNotEqual("cached", self.render("{% formset_empty_form formset fields_class='other' %}"))
+        self.assertNotEqual("cached", silhouette.render_formset_empty_form(MockFormSet(prefix="other")))
+
+    @override_settings(TEMPLATE_CONTEXT_PROCESSORS=['django.template.context_processors.csrf'])
+    def test_render_empty_form_with_request(self):
+        request = HttpRequest()
+        result = silhouette.render_formset_empty_form(self.formset, request=request, cache=False)
+        self.assertIn('name="form-__prefix__-field1"', result)
+        self.assertEqual(result, silhouette.render_formset_empty_form(self.formset, request=request))
+
+    def test_empty_form_cache_opt_out(self):
+        self.render("{% formset_empty_form formset cache=False %}")
+        self.assertEqual(0, len(self.cache._cache))
+
+    def test_empty_form_cascaded_attributes(self):
+        self.render("{% formset_empty_form formset %}")
+        self.render("{% formset_empty_form formset %}", fields_attrs={"class": "cascaded"})
+        self.assertEqual(2, len(self.cache._cache))
+
+    def test_empty_form_view(self):
+        view = FormsetEmptyFormView.as_view(formset_class=MockFormSet, cache_timeout=60)
+        request = HttpRequest()
+        request.method = "GET"
+        response = view(request)
+        self.assertIn('name="form-__prefix__-field1"', response.content.decode())
+        self.assertIn("max-age=60", response["Cache-Control"])
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("Accept-Language", response["Vary"])
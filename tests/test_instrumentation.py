@@ -0,0 +1,126 @@
+from __future__ import unicode_literals
+
+import logging
+
+from django.core.cache import caches
+from django.http import HttpRequest, HttpResponse
+from django.test import SimpleTestCase
+from django.template.context import Context
+try:
+    from django.template.loader import get_template_from_string
+except ImportError:
+    from django.template import engines
+    get_template_from_string = engines['django'].from_string
+
+
+from .mock.forms import MockForm2
+
+from silhouette import instrumentation
+from silhouette.middleware import ProfileMiddleware
+
+
+class TestProfile(SimpleTestCase):
+
+    def render(self, template_source, **context):
+        return get_template_from_string("{% load silhouette_tags %}" + template_source).render(Context(context))
+
+    def test_listeners_are_only_registered_while_profiling(self):
+        self.assertEqual((), instrumentation.listeners)
+        with instrumentation.profile():
+            self.assertEqual((instrumentation.profiler,), instrumentation.listeners)
+        self.assertEqual((), instrumentation.listeners)
+
+    def test_renders_are_recorded(self):
+        with instrumentation.profile() as profile:
+            self.render("{% silhouette form %}", form=MockForm2())
+        outer = profile.renders[0]
+        self.assertEqual(("Form", "MockForm2", 0), (outer.tag, outer.obj, outer.depth))
+        self.assertEqual("silhouette/base/forms/form.html", outer.template)
+        self.assertEqual(("silhouette/mock_form_2.html", "silhouette/mock_form_2/form.html",
+                          "silhouette/theme/forms/form.html", "silhouette/base/forms/form.html"), outer.candidates)
+        self.assertIn(outer.loader_cache, ("hit", "miss"))
+        self.assertIsNone(outer.fragment_cache)
+        self.assertIn(("Field", "MockForm2.field1", 2), [(render.tag, render.obj, render.depth) for render in profile.renders])
+        self.assertAlmostEqual(outer.total, profile.total)
+        self.assertAlmostEqual(outer.total, outer.self_time + sum(render.total for render in profile.renders if render.depth == 1))
+
+    def test_loader_cache(self):
+        form = MockForm2()
+        with instrumentation.profile() as profile:
+            self.render("{% field form.field1 %}{% field form.field1 %}", form=form)
+        field_renders = [render for render in profile.renders if render.tag == "Field"]
+        self.assertEqual("hit", field_renders[1].loader_cache)
+
+    def test_fallbacks_are_recorded(self):
+        with instrumentation.profile() as profile:
+            self.render("{% field_widget form.field1 %}", form=MockForm2())
+        self.assertIsNone(profile.renders[0].template)
+        self.assertEqual(3, len(profile.renders[0].candidates))
+
+    def test_template_override(self):
+        with instrumentation.profile() as profile:
+            self.render("{% field form.field1 template='silhouette/base/fields/field.html' %}", form=MockForm2())
+        self.assertEqual("silhouette/base/fields/field.html", profile.renders[0].template)
+
+    def test_fragment_cache(self):
+        caches['default'].clear()
+        with instrumentation.profile() as profile:
+            self.render("{% field form.field1 cache=True %}{% field form.field1 cache=True %}", form=MockForm2())
+        caches['default'].clear()
+        self.assertEqual(["miss", "hit"], [render.fragment_cache for render in profile.renders if render.depth == 0])
+
+    def test_slowest(self):
+        with instrumentation.profile() as profile:
+            self.render("{% silhouette form %}", form=MockForm2())
+        slowest = profile.slowest(2)
+        self.assertEqual(2, len(slowest))
+        self.assertGreaterEqual(slowest[0].self_time, slowest[1].self_time)
+        self.assertEqual(2, len(instrumentation.format_profile(profile, 2)))
+
+
+class TestProfileMiddleware(SimpleTestCase):
+
+    def setUp(self):
+        self.logger = logging.getLogger("silhouette.profile")
+        self.records = []
+        self.handler = logging.Handler()
+        self.handler.emit = self.records.append
+        self.logger.addHandler(self.handler)
+        self.logger.setLevel(logging.INFO)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        self.logger.setLevel(logging.NOTSET)
+
+    def test_slowest_renders_are_logged(self):
+        request = HttpRequest()
+        request.method = "GET"
+        request.path = "/form/"
+        middleware = ProfileMiddleware()
+        middleware.process_request(request)
+        get_template_from_string("{% load silhouette_tags %}{% silhouette form %}").render(Context({"form": MockForm2()}))
+        with self.settings(SILHOUETTE_PROFILE_SLOWEST=3):
+            middleware.process_response(request, HttpResponse())
+        self.assertEqual((), instrumentation.listeners)
+        self.assertEqual(1, len(self.records))
+        message = self.records[0].getMessage()
+        self.assertIn("GET /form/", message)
+        self.assertEqual(4, len(message.splitlines()))
+
+    def test_profile_is_shared_with_panel(self):
+        middleware = ProfileMiddleware()
+        middleware.process_request(HttpRequest())
+        # The debug toolbar panel starts profiling after the middleware and stops before it
+        panel_profile = instrumentation.profiler.start()
+        get_template_from_string("{% load silhouette_tags %}{% silhouette form %}").render(Context({"form": MockForm2()}))
+        instrumentation.profiler.stop()
+        middleware.process_response(HttpRequest(), HttpResponse())
+        self.assertEqual((), instrumentation.listeners)
+        self.assertTrue(panel_profile.renders)
+        self.assertIn("{} tags rendered".format(len(panel_profile.renders)), self.records[0].getMessage())
+
+    def test_nothing_is_logged_without_renders(self):
+        middleware = ProfileMiddleware()
+        middleware.process_request(HttpRequest())
+        middleware.process_response(HttpRequest(), HttpResponse())
+        self.assertEqual([], self.records)
@@ -0,0 +1,98 @@
+from __future__ import unicode_literals
+
+import unittest
+
+from django.template.context import Context
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from django.utils.html import strip_spaces_between_tags
+try:
+    from django.template.loader import get_template_from_string
+except ImportError:
+    from django.template import engines
+    get_template_from_string = engines['django'].from_string
+try:
+    import jinja2
+except ImportError:  # pragma: no cover
+    jinja2 = None
+
+
+from .mock.forms import MockForm, MockFormSet
+
+JINJA2_TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.jinja2.Jinja2",
+        "APP_DIRS": True,
+        "OPTIONS": {"environment": "silhouette.jinja.environment"},
+    },
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "APP_DIRS": True,
+    },
+]
+
+
+@unittest.skipIf(jinja2 is None, "Jinja2 is not installed")
+class TestJinjaTags(SimpleTestCase):
+
+    def setUp(self):
+        from silhouette.jinja import environment
+        self.environment = environment(autoescape=True)
+        self.form = MockForm({})
+        self.formset = MockFormSet()
+
+    def tearDown(self):
+        self.form = None
+        self.formset = None
+
+    def render(self, source, **context):
+        context.setdefault("form", self.form)
+        context.setdefault("my_formset", self.formset)
+        return self.environment.from_string(source).render(**context)
+
+    def render_django(self, source, **context):
+        context.setdefault("form", self.form)
+        context.setdefault("formset", self.formset)
+        return get_template_from_string("{% load silhouette_tags %}" + source).render(Context(context))
+
+    def test_globals(self):
+        for name in ("silhouette", "form_fields", "formset", "formset_form", "field", "field_widget", "field_label"):
+            self.assertIn(name, self.environment.globals)
+        self.assertIn("to_html_attrs", self.environment.filters)
+
+    def test_field_with_django_theme(self):
+        self.assertEqual(self.render_django('{% field form.url_input widget_class="url" label_contents="Url" %}'),
+                         self.render('{{ field(form.url_input, widget_class="url", label_contents="Url") }}'))
+
+    def test_form_with_django_theme(self):
+        self.assertEqual(self.render_django('{% silhouette form action="/" fields_class="f" %}'),
+                         self.render('{{ silhouette(form, action="/", fields_class="f") }}'))
+
+    def test_output_is_escaped(self):
+        result = self.render('{{ field_help_text(form.text_input, template="does/not/exist.html", contents=contents) }}',
+                             contents="<b>")
+        self.assertEqual("&lt;b&gt;", result)
+
+    def test_formset_with_django_theme(self):
+        self.assertEqual(self.render_django('{% formset formset %}'), self.render('{{ formset(my_formset) }}'))
+
+    @override_settings(TEMPLATES=JINJA2_TEMPLATES)
+    def test_jinja_theme(self):
+        result = self.render('{{ silhouette(form, action="/") }}')
+        self.assertTrue(result.startswith('<form action="/" enctype="multipart/form-data">'))
+        self.assertIn('<label for="id_url_input">Url input:</label><input id="id_url_input" name="url_input" type="url" />'
+                      '<ul><li>This field is required.</li></ul>', result)
+        self.assertIn('<button type="submit">Submit</button></form>', result)
+
+    @override_settings(TEMPLATES=JINJA2_TEMPLATES)
+    def test_jinja_theme_matches_django_theme(self):
+        jinja_result = self.render('{{ formset(my_formset) }}')
+        with override_settings(TEMPLATES=JINJA2_TEMPLATES[1:]):
+            django_result = self.render_django('{% formset formset %}')
+        self.assertEqual(strip_spaces_between_tags(django_result.strip()), strip_spaces_between_tags(jinja_result))
+
+    @override_settings(TEMPLATES=JINJA2_TEMPLATES)
+    def test_jinja_theme_from_django_template(self):
+        result = self.render_django('{% field form.url_input %}')
+        self.assertIn('<input id="id_url_input" name="url_input" type="url" />', result)
+        self.assertNotIn("&lt;", result)
@@ -1,3 +1,7 @@
+import gc
+import os
+import shutil
+import tempfile
 import unittest
 from django.forms.formsets import formset_factory
 try:
@@ -10,10 +14,10 @@ except ImportError:
     from django.template.exceptions import TemplateDoesNotExist
 from django.test.utils import override_settings
 
-from .pods_utils import clear_app_settings_cache
 from .mock import forms
+from .test_whitespace import WHITESPACE_TEMPLATES
 
-from silhouette.loaders import loader
+from silhouette.loaders import loader, DefaultLoader, IndexedLoader
 
 
 PATH = 'test_loaders'
@@ -35,6 +39,9 @@ PATTERNS = {
         "{path}/{theme}/does-not-exist-2-{form}.html",
         "{path}/{theme}/fallback-{form}.html",
     ),
+    "test_whitespace": (
+        "{path}/{theme}/whitespace-{form}.html",
+    ),
     "test_notfound": (
         "{path}/{theme}/does-not-exist-1.html",
         "{path}/{theme}/does-not-exist-2.html",
@@ -44,9 +51,6 @@ PATTERNS = {
 
 class TestLoaders(unittest.TestCase):
 
-    def tearDown(self):
-        clear_app_settings_cache()
-
     def test_get_template_for_form(self):
         obj = forms.MockForm()
         self.assertIsInstance(loader.get_template(obj, 'test_form', path=PATH, theme=THEME, patterns=PATTERNS), Template)
@@ -80,3 +84,179 @@ class TestLoaders(unittest.TestCase):
     def test_get_template_with_user_settings_overrides(self):
         obj = forms.MockForm()
         self.assertIsInstance(loader.get_template(obj, 'test_form'), Template)
+
+
+class CountingLoader(DefaultLoader):
+
+    def __init__(self, *args, **kwargs):
+        super(CountingLoader, self).__init__(*args, **kwargs)
+        self.selected = []
+
+    def select_template(self, template_names):
+        self.selected.append(template_names)
+        return super(CountingLoader, self).select_template(template_names)
+
+
+class TestLoaderCache(unittest.TestCase):
+
+    def setUp(self):
+        self.loader = CountingLoader()
+
+    def tearDown(self):
+        self.loader = None
+
+    def test_get_template_is_cached_by_signature(self):
+        template = self.loader.get_template(forms.MockForm()['text_input'], 'test_field', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.assertIs(template, self.loader.get_template(forms.MockForm()['text_input'], 'test_field', path=PATH, theme=THEME, patterns=PATTERNS))
+        self.assertEqual(1, len(self.loader.selected))
+
+    def test_signature_includes_field_path_and_theme(self):
+        self.loader.get_template(forms.MockForm(), 'test_form', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.loader.get_template(forms.MockForm(), 'test_form', path=PATH + "/", theme=THEME, patterns=PATTERNS)
+        self.loader.get_template(forms.MockForm(), 'test_fallback', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.assertEqual(3, len(self.loader.selected))
+
+    def test_cache_is_bounded(self):
+        self.loader = CountingLoader(cache_size=1)
+        self.loader.get_template(forms.MockForm(), 'test_form', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.loader.get_template(forms.MockForm(), 'test_fallback', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.loader.get_template(forms.MockForm(), 'test_form', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.assertEqual(3, len(self.loader.selected))
+        self.assertEqual(1, len(self.loader.cache))
+
+    def test_large_form_reaches_steady_state(self):
+        from django import forms as django_forms
+        from django.template import Context, Template as DjangoTemplate
+        from silhouette import instrumentation, stats
+        large_form_class = type(str("LargeForm"), (django_forms.Form,),
+                                {"field_{}".format(i): django_forms.CharField() for i in range(220)})
+        template = DjangoTemplate("{% load silhouette_tags %}{% silhouette form %}")
+        loader.clear_cache()
+        collector = stats.Collector()
+        template.render(Context({"form": large_form_class()}))
+        instrumentation.add_listener(collector)
+        try:
+            template.render(Context({"form": large_form_class()}))
+        finally:
+            instrumentation.remove_listener(collector)
+        self.assertGreater(len(loader.cache), 1024)
+        self.assertLess(len(loader.cache), loader.cache.maxsize)
+        self.assertEqual(1.0, collector.snapshot()['loader_hit_ratio'])
+
+    @override_settings(SILHOUETTE_CACHE_SIZE=50)
+    def test_runtime_classes_are_evicted(self):
+        from django.template import Context, Template as DjangoTemplate
+        template = DjangoTemplate("{% load silhouette_tags %}{% formset formset %}")
+        for i in range(200):
+            template.render(Context({"formset": formset_factory(forms.MockForm2)()}))
+        gc.collect()
+        self.assertEqual(50, len(loader.cache))
+        self.assertLessEqual(len(loader.names), 50)
+
+    def test_templates_are_reloaded_with_debug(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        templates = [{"BACKEND": "django.template.backends.django.DjangoTemplates", "DIRS": [directory]}]
+        with override_settings(DEBUG=True, TEMPLATES=templates, TEMPLATE_DIRS=[directory]):
+            for content in ("ONE", "TWO"):
+                with open(os.path.join(directory, "mock_form.html"), "w") as fp:
+                    fp.write(content)
+                template = self.loader.get_template(forms.MockForm(), 'form', patterns={'form': ("{form}.html",)})
+                self.assertEqual(content, template.render({}))
+
+    def test_cache_is_cleared_when_settings_change(self):
+        self.loader.get_template(forms.MockForm(), 'test_form', path=PATH, theme=THEME, patterns=PATTERNS)
+        with override_settings(SILHOUETTE_THEME=THEME):
+            self.assertEqual(0, len(self.loader.cache))
+            self.loader.get_template(forms.MockForm(), 'test_form', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.assertEqual(0, len(self.loader.cache))
+        self.assertEqual(2, len(self.loader.selected))
+
+    def test_find_template_returns_none_when_not_found(self):
+        self.assertIsNone(self.loader.find_template(forms.MockForm(), 'test_notfound', path=PATH, theme=THEME, patterns=PATTERNS))
+
+    def test_missing_templates_are_cached(self):
+        self.loader.find_template(forms.MockForm(), 'test_notfound', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.assertIsNone(self.loader.find_template(forms.MockForm(), 'test_notfound', path=PATH, theme=THEME, patterns=PATTERNS))
+        with self.assertRaises(TemplateDoesNotExist):
+            self.loader.get_template(forms.MockForm(), 'test_notfound', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.assertEqual(1, len(self.loader.selected))
+
+    def test_whitespace_is_kept_by_default(self):
+        template = self.loader.get_template(forms.MockForm(), 'test_whitespace', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.assertEqual("<div>\n    \n        <span> prefix</span>\n    \n</div>\n", template.render({}))
+
+    @override_settings(TEMPLATES=WHITESPACE_TEMPLATES, TEMPLATE_LOADERS=WHITESPACE_TEMPLATES[0]['OPTIONS']['loaders'])
+    def test_whitespace_is_stripped_by_whitespace_loader(self):
+        template = self.loader.get_template(forms.MockForm(), 'test_whitespace', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.assertEqual("<div><span> prefix</span></div>", template.render({}))
+
+    def test_names_are_computed_once_per_class(self):
+        substitutes = self.loader.get_substitutes(forms.MockForm()['text_input'], PATH, THEME)
+        self.assertEqual({'path': PATH, 'theme': THEME, 'form': 'mock_form', 'field': 'text_input', 'widget': 'text_input'}, substitutes)
+        names = self.loader.names[forms.MockForm]
+        self.assertIs(names, self.loader.names[forms.MockForm])
+        self.assertIs(names.field_substitutes('text_input', type(forms.MockForm()['text_input'].field.widget)),
+                      names.field_substitutes('text_input', type(forms.MockForm()['text_input'].field.widget)))
+
+
+class TestIndexedLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.loader = IndexedLoader()
+
+    def tearDown(self):
+        self.loader = None
+
+    def test_index_contains_template_names(self):
+        index = self.loader.get_index()
+        self.assertIn('test_loaders/loader/mock_form.html', index)
+        self.assertIn('silhouette/base/forms/form.html', index)
+
+    def test_get_template_using_index(self):
+        obj = forms.MockForm()
+        self.assertIsInstance(self.loader.get_template(obj, 'test_fallback', path=PATH, theme=THEME, patterns=PATTERNS), Template)
+
+    def test_get_template_fail_when_not_in_index(self):
+        with self.assertRaises(TemplateDoesNotExist):
+            self.loader.get_template(forms.MockForm(), 'test_notfound', path=PATH, theme=THEME, patterns=PATTERNS)
+
+    def test_index_is_frozen_without_debug(self):
+        self.loader.get_template(forms.MockForm(), 'test_form', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.loader.mtimes = {directory: 0 for directory in self.loader.mtimes}
+        self.loader.get_template(forms.MockForm(), 'test_form', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.assertIsNotNone(self.loader.index)
+        self.assertEqual(1, len(self.loader.cache))
+
+    @override_settings(DEBUG=True)
+    def test_index_is_rebuilt_when_stale_with_debug(self):
+        self.loader.get_template(forms.MockForm(), 'test_form', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.assertFalse(self.loader.is_stale())
+        self.loader.mtimes = {directory: 0 for directory in self.loader.mtimes}
+        self.assertTrue(self.loader.is_stale())
+        self.loader.last_check = 0
+        self.loader.get_template(forms.MockForm(), 'test_form', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.assertFalse(self.loader.is_stale())
+
+    @override_settings(DEBUG=True)
+    def test_staleness_is_checked_once_per_interval(self):
+        self.loader.get_template(forms.MockForm(), 'test_form', path=PATH, theme=THEME, patterns=PATTERNS)
+        index = self.loader.index
+        self.loader.mtimes = {directory: 0 for directory in self.loader.mtimes}
+        self.loader.get_template(forms.MockForm(), 'test_form', path=PATH, theme=THEME, patterns=PATTERNS)
+        self.assertTrue(self.loader.is_stale())
+        self.assertIs(index, self.loader.index)
+
+    def test_edited_template_is_stale(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        filename = os.path.join(directory, "mock_form.html")
+        with open(filename, "w") as fp:
+            fp.write("ONE")
+        templates = [{"BACKEND": "django.template.backends.django.DjangoTemplates", "DIRS": [directory]}]
+        with override_settings(TEMPLATES=templates, TEMPLATE_DIRS=[directory]):
+            self.loader.get_index()
+            self.assertFalse(self.loader.is_stale())
+            mtime = os.stat(filename).st_mtime + 10
+            os.utime(filename, (mtime, mtime))
+            self.assertTrue(self.loader.is_stale())
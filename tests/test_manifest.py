@@ -0,0 +1,110 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test.utils import override_settings
+from django.utils.six import StringIO
+
+from .mock import forms
+
+from silhouette.loaders import DefaultLoader, MANIFEST_SEPARATOR
+from silhouette.manifest import get_form_classes, get_template_types, build_manifest
+
+
+PATTERNS = {
+    "test_form": (
+        "{path}/{theme}/{form}.html",
+    ),
+    "test_formset": (
+        "{path}/{theme}/{formset}.html",
+    ),
+    "test_field": (
+        "{path}/{theme}/{form}-{field}-{widget}.html",
+        "{path}/{theme}/does-not-exist.html",
+    ),
+    "test_unknown": (
+        "{path}/{theme}/unknown.html",
+    ),
+}
+
+
+class CountingLoader(DefaultLoader):
+
+    def __init__(self, *args, **kwargs):
+        super(CountingLoader, self).__init__(*args, **kwargs)
+        self.selected = []
+
+    def select_template(self, template_names):
+        self.selected.append(template_names)
+        return super(CountingLoader, self).select_template(template_names)
+
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.loader = CountingLoader()
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'manifest.json')
+
+    def tearDown(self):
+        self.loader = None
+        shutil.rmtree(self.directory)
+
+    def test_get_form_classes_from_installed_apps(self):
+        form_classes = get_form_classes()
+        self.assertIn(forms.MockForm, form_classes)
+        self.assertIn(forms.MockFormSet, form_classes)
+
+    @override_settings(SILHOUETTE_COMPILE_FORMS=['tests.mock.forms.MockForm2'])
+    def test_get_form_classes_from_settings(self):
+        self.assertEqual([forms.MockForm2], get_form_classes())
+
+    def test_get_template_types(self):
+        self.assertEqual({'form': ['test_form'], 'formset': ['test_formset'], 'field': ['test_field']}, get_template_types(PATTERNS))
+
+    def test_build_manifest(self):
+        manifest = build_manifest(self.loader, [forms.MockFormSet], path='test_loaders', theme='loader', patterns=PATTERNS)
+        self.assertEqual({
+            'test_loaders/loader/mock_form_2_form_set.html': None,
+            'test_loaders/loader/mock_form_2.html': None,
+            MANIFEST_SEPARATOR.join(['test_loaders/loader/mock_form_2-field_1-text_input.html', 'test_loaders/loader/does-not-exist.html']): None,
+        }, manifest)
+        manifest = build_manifest(self.loader, [forms.MockForm], path='test_loaders', theme='loader', patterns=PATTERNS)
+        self.assertEqual('test_loaders/loader/mock_form.html', manifest['test_loaders/loader/mock_form.html'])
+        self.assertEqual('test_loaders/loader/mock_form-text_input-text_input.html',
+                         manifest[MANIFEST_SEPARATOR.join(['test_loaders/loader/mock_form-text_input-text_input.html', 'test_loaders/loader/does-not-exist.html'])])
+
+    def test_loader_uses_manifest(self):
+        call_command('silhouette_compile', output=self.filename, stdout=StringIO())
+        self.loader.load_manifest(self.filename)
+        self.assertTrue(self.loader.manifest)
+        self.loader.get_template(forms.MockForm(), 'form')
+        self.loader.find_template(forms.MockForm()['text_input'], 'field_widget')
+        self.assertEqual([], self.loader.selected)
+
+    def test_command_writes_manifest(self):
+        with override_settings(SILHOUETTE_MANIFEST=self.filename, SILHOUETTE_COMPILE_FORMS=['tests.mock.forms.MockForm']):
+            call_command('silhouette_compile', stdout=StringIO())
+        with open(self.filename) as manifest:
+            templates = json.load(manifest)['templates']
+        self.assertIn('silhouette/base/forms/form.html', templates.values())
+
+    def test_missing_manifest_is_ignored(self):
+        self.loader.load_manifest(self.filename)
+        self.assertIsNone(self.loader.manifest)
+        self.loader.get_template(forms.MockForm(), 'form')
+        self.assertEqual(1, len(self.loader.selected))
+
+    def test_command_creates_missing_manifest(self):
+        from django.apps import apps
+        with override_settings(SILHOUETTE_MANIFEST=self.filename, SILHOUETTE_COMPILE_FORMS=['tests.mock.forms.MockForm']):
+            apps.get_app_config('silhouette').ready()
+            call_command('silhouette_compile', stdout=StringIO())
+        self.assertTrue(os.path.exists(self.filename))
+
+    def test_command_requires_output(self):
+        with self.assertRaises(CommandError):
+            call_command('silhouette_compile', stdout=StringIO())
@@ -0,0 +1,114 @@
+from __future__ import unicode_literals
+
+import datetime
+import threading
+
+from django import forms
+from django.forms.formsets import formset_factory
+from django.test import SimpleTestCase
+from django.template.context import Context
+try:
+    from django.template.loader import get_template_from_string
+except ImportError:
+    from django.template import engines
+    get_template_from_string = engines['django'].from_string
+
+from django.test.utils import override_settings
+from django.utils import timezone, translation
+
+
+from .mock.forms import MockForm2, MockFormSet
+
+import silhouette
+from silhouette import parallel
+from silhouette.templatetags.silhouette_tags import Formset
+
+
+class TestParallel(SimpleTestCase):
+
+    def test_imap_preserves_order(self):
+        self.assertEqual([0, 2, 4, 6], list(parallel.imap(lambda i: i * 2, range(4))))
+
+    def test_imap_runs_in_workers(self):
+        self.assertFalse(parallel.in_worker())
+        self.assertEqual([True], list(parallel.imap(lambda i: parallel.in_worker(), [0])))
+        self.assertNotIn(threading.current_thread(), list(parallel.imap(lambda i: threading.current_thread(), [0])))
+
+
+    def test_imap_without_workers(self):
+        with override_settings(SILHOUETTE_PARALLEL_WORKERS=0):
+            self.assertFalse(parallel.is_enabled())
+            self.assertEqual([False], list(parallel.imap(lambda i: parallel.in_worker(), [0])))
+
+    def test_pool_is_resized(self):
+        with override_settings(SILHOUETTE_PARALLEL_WORKERS=2):
+            pool = parallel.get_pool()
+            self.assertEqual(2, len(pool._pool))
+        self.assertIsNot(pool, parallel.get_pool())
+
+    def test_imap_uses_active_language(self):
+        with translation.override('fr'):
+            self.assertEqual(['fr'], list(parallel.imap(lambda i: translation.get_language(), [0])))
+
+
+class LocalizedForm(forms.Form):
+    choice = forms.NullBooleanField()
+    date = forms.DateTimeField(initial=datetime.datetime(2016, 1, 1, 12, tzinfo=timezone.utc))
+
+
+LocalizedFormSet = formset_factory(LocalizedForm, extra=3)
+
+
+class ModelChoiceForm(forms.Form):
+    choice = forms.ModelChoiceField(queryset=None)
+
+
+class TestParallelFormset(SimpleTestCase):
+
+    def setUp(self):
+        self.formset = MockFormSet(data={'form-TOTAL_FORMS': '3',
+                                         'form-INITIAL_FORMS': '0',
+                                         'form-MAX_NUM_FORMS': '',
+                                         'form-0-field1': 'val',
+                                         'form-1-field1': 'value',
+                                         'form-2-field1': 'values'})
+        self.template = get_template_from_string("""{% load silhouette_tags %}{% formset formset fields_class="parallel" %}""")
+
+    def tearDown(self):
+        self.formset = None
+
+    def render(self):
+        return self.template.render(Context({"formset": self.formset}))
+
+    def test_parallel_matches_sequential(self):
+        sequential = self.render()
+        with override_settings(SILHOUETTE_PARALLEL_THRESHOLD=2):
+            self.assertEqual(sequential, self.render())
+
+    def test_stream_parallel(self):
+        sequential = list(silhouette.stream_formset(self.formset, fields_class="parallel"))
+        with override_settings(SILHOUETTE_PARALLEL_THRESHOLD=2):
+            self.assertEqual(sequential, list(silhouette.stream_formset(self.formset, fields_class="parallel")))
+
+    @override_settings(USE_TZ=True)
+    def test_parallel_uses_active_language_and_timezone(self):
+        template = get_template_from_string("""{% load silhouette_tags %}{% formset formset %}""")
+        with translation.override('fr'), timezone.override(timezone.get_fixed_timezone(600)):
+            sequential = template.render(Context({"formset": LocalizedFormSet()}))
+            with override_settings(SILHOUETTE_PARALLEL_THRESHOLD=2):
+                self.assertEqual(sequential, template.render(Context({"formset": LocalizedFormSet()})))
+        self.assertEqual(3, sequential.count("Inconnu"))
+        self.assertEqual(3, sequential.count("2016-01-01 22:00:00"))
+
+    @override_settings(SILHOUETTE_PARALLEL_THRESHOLD=1)
+    def test_forms_querying_database_are_sequential(self):
+        formset = formset_factory(ModelChoiceForm)()
+        self.assertTrue(parallel.queries_database(formset, [ModelChoiceForm()]))
+        self.assertFalse(Formset(Context(), formset).is_parallel([ModelChoiceForm()]))
+        self.assertFalse(parallel.queries_database(self.formset, [MockForm2()]))
+        self.assertTrue(Formset(Context(), self.formset).is_parallel([MockForm2()]))
+
+    def test_parallel_without_workers(self):
+        sequential = self.render()
+        with override_settings(SILHOUETTE_PARALLEL_THRESHOLD=2, SILHOUETTE_PARALLEL_WORKERS=0):
+            self.assertEqual(sequential, self.render())
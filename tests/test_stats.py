@@ -0,0 +1,113 @@
+from __future__ import unicode_literals
+
+import threading
+
+from django.apps import apps
+from django.test import SimpleTestCase
+from django.template.context import Context
+try:
+    from django.template.loader import get_template_from_string
+except ImportError:
+    from django.template import engines
+    get_template_from_string = engines['django'].from_string
+
+from django.test.utils import override_settings
+
+
+from .mock.forms import MockForm2
+
+from silhouette import instrumentation, stats
+
+
+class TestHistogram(SimpleTestCase):
+
+    def test_observe(self):
+        histogram = stats.Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual(4, snapshot['count'])
+        self.assertAlmostEqual(2.65, snapshot['sum'])
+        self.assertEqual([(0.1, 2), (1.0, 3), (float('inf'), 4)], snapshot['buckets'])
+
+
+class TestStats(SimpleTestCase):
+
+    def setUp(self):
+        stats.reset()
+        stats.enable()
+
+    def tearDown(self):
+        stats.disable()
+        stats.reset()
+
+    def render(self, template_source, **context):
+        return get_template_from_string("{% load silhouette_tags %}" + template_source).render(Context(context))
+
+    def test_disabled_by_default(self):
+        stats.disable()
+        self.assertFalse(stats.is_enabled())
+        self.assertEqual((), instrumentation.listeners)
+        self.render("{% silhouette form %}", form=MockForm2())
+        self.assertEqual({}, stats.snapshot()['renders'])
+
+    def test_renders(self):
+        self.render("{% silhouette form %}", form=MockForm2())
+        renders = stats.snapshot()['renders']
+        self.assertEqual(1, renders['form', 'MockForm2', 'theme']['count'])
+        self.assertEqual(1, renders['field', 'MockForm2', 'theme']['count'])
+
+    def test_lookups_and_fallbacks(self):
+        form = MockForm2()
+        self.render("{% field_widget form.field1 %}{% field_widget form.field1 %}", form=form)
+        snapshot = stats.snapshot()
+        self.assertEqual(1, snapshot['lookups']['field_widget', 'MockForm2', 'theme', 'hit'])
+        self.assertEqual(2, snapshot['fallbacks']['field_widget', 'MockForm2', 'theme'])
+        self.assertEqual(2, snapshot['resolutions']['field_widget', 'MockForm2', 'theme']['count'])
+        self.assertIsNotNone(snapshot['loader_hit_ratio'])
+        self.assertIsNone(snapshot['fragment_hit_ratio'])
+
+    def test_hit_ratio(self):
+        self.assertEqual(0.75, stats.hit_ratio({('a', 'hit'): 2, ('b', 'hit'): 1, ('a', 'miss'): 1}))
+        self.assertIsNone(stats.hit_ratio({}))
+
+    def test_reset(self):
+        self.render("{% silhouette form %}", form=MockForm2())
+        stats.reset()
+        self.assertEqual({}, stats.snapshot()['renders'])
+        self.assertEqual({}, stats.snapshot()['lookups'])
+
+    def test_threads(self):
+        template = get_template_from_string("{% load silhouette_tags %}{% field form.field1 %}")
+        form = MockForm2()
+
+        def render():
+            for i in range(50):
+                template.render(Context({"form": form}))
+
+        threads = [threading.Thread(target=render) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(200, stats.snapshot()['renders']['field', 'MockForm2', 'theme']['count'])
+
+    def test_prometheus(self):
+        self.render("{% field_widget form.field1 %}", form=MockForm2())
+        text = stats.prometheus()
+        self.assertIn("# TYPE silhouette_render_seconds histogram\n", text)
+        self.assertIn('silhouette_render_seconds_bucket{template_type="field_widget",form="MockForm2",theme="theme",le="+Inf"} 1\n', text)
+        self.assertIn('silhouette_render_seconds_count{template_type="field_widget",form="MockForm2",theme="theme"} 1\n', text)
+        self.assertIn('silhouette_template_fallbacks_total{template_type="field_widget",form="MockForm2",theme="theme"} 1\n', text)
+        self.assertIn('silhouette_template_lookups_total{template_type="field_widget",form="MockForm2",theme="theme",result=', text)
+
+    def test_prometheus_escapes_labels(self):
+        text = stats.prometheus({'renders': {}, 'resolutions': {}, 'lookups': {}, 'fragments': {},
+                                 'fallbacks': {('form', 'Form', 'a "b"\\c'): 1}})
+        self.assertIn('theme="a \\"b\\"\\\\c"} 1', text)
+
+    @override_settings(SILHOUETTE_STATS=True)
+    def test_enabled_by_setting(self):
+        stats.disable()
+        apps.get_app_config('silhouette').ready()
+        self.assertTrue(stats.is_enabled())
@@ -0,0 +1,64 @@
+from __future__ import unicode_literals
+
+from django.test import SimpleTestCase
+from django.http import HttpRequest
+from django.template.context import Context
+try:
+    from django.template.loader import get_template_from_string
+except ImportError:
+    from django.template import engines
+    get_template_from_string = engines['django'].from_string
+
+from django.test.utils import override_settings
+from django.utils.html import strip_spaces_between_tags
+
+
+from .mock.forms import MockFormSet
+
+import silhouette
+from silhouette.templatetags.silhouette_tags import Formset
+
+
+@override_settings(SILHOUETTE_PATH="test_streaming")
+class TestStreamFormset(SimpleTestCase):
+
+    def setUp(self):
+        self.formset = MockFormSet(data={'form-TOTAL_FORMS': '2',
+                                         'form-INITIAL_FORMS': '0',
+                                         'form-MAX_NUM_FORMS': '',
+                                         'form-0-field1': 'val',
+                                         'form-1-field1': 'value'})
+
+    def tearDown(self):
+        self.formset = None
+
+    def render(self, source, **context):
+        context['formset'] = self.formset
+        return get_template_from_string("{% load silhouette_tags %}" + source).render(Context(context))
+
+    def test_stream_formset(self):
+        chunks = list(silhouette.stream_formset(self.formset))
+        self.assertEqual(4, len(chunks))
+        self.assertIn('name="form-TOTAL_FORMS"', chunks[0])
+        self.assertIn('name="form-0-field1"', chunks[1])
+        self.assertIn('name="form-1-field1"', chunks[2])
+        self.assertNotIn(Formset.STREAM_MARKER, "".join(chunks))
+
+    def test_stream_matches_tag(self):
+        self.assertEqual(self.render("{% formset formset %}"),
+                         strip_spaces_between_tags("".join(silhouette.stream_formset(self.formset))))
+
+    def test_stream_with_attributes(self):
+        self.assertEqual(self.render('{% formset formset fields_class="stream" %}'),
+                         strip_spaces_between_tags("".join(silhouette.stream_formset(self.formset, fields_class="stream"))))
+
+    @override_settings(TEMPLATE_CONTEXT_PROCESSORS=['django.template.context_processors.csrf'])
+    def test_stream_with_request(self):
+        request = HttpRequest()
+        chunks = list(silhouette.stream_formset(self.formset, request, context={"extra": "context"}))
+        self.assertEqual(self.render("{% formset formset %}"), strip_spaces_between_tags("".join(chunks)))
+
+    def test_stream_without_forms_block(self):
+        chunks = list(silhouette.stream_formset(self.formset, template="test_streaming/no_stream.html"))
+        self.assertEqual(1, len(chunks))
+        self.assertIn("form-0form-1", chunks[0])
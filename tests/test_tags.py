@@ -1,7 +1,11 @@
 from __future__ import unicode_literals
 
+from django.core.cache import caches
+from django.http import HttpRequest
+from django.forms import ChoiceField
 from django.test import SimpleTestCase
-from django.template.context import Context
+from django.template.base import Template, TemplateSyntaxError
+from django.template.context import Context, RequestContext
 try:
     from django.template.base import TemplateDoesNotExist
 except ImportError:
@@ -13,12 +17,16 @@ except ImportError:
     get_template_from_string = engines['django'].from_string
 
 from django.test.utils import override_settings
+from django.utils import timezone, translation
+from django.utils.translation import ugettext_lazy
 
-from .pods_utils import clear_app_settings_cache
 
-from .mock.forms import MockForm, MockFormSet
+from .mock.forms import MockForm, MockForm2, MockFormSet
 from .mock.tags import MockTag
 
+from silhouette.fragments import CSRF_PLACEHOLDER, get_fragment_key
+from silhouette.templatetags.silhouette_tags import Field, FieldLabel, SilhouetteNode
+
 
 @override_settings(SILHOUETTE_PATH="test_tags/base/silhouette",
                    SILHOUETTE_PATTERNS = {"mock_tag": ("{path}/{theme}/{form}.html",)})
@@ -30,7 +38,6 @@ class TestBaseTag(SimpleTestCase):
 
     def tearDown(self):
         self.context = None
-        clear_app_settings_cache()
 
     def test_template_type(self):
         tag = MockTag(self.context, self.form)
@@ -95,15 +102,108 @@ class TestBaseTag(SimpleTestCase):
                 self.assertIn("cascaded", self.context['attrs']['class'].split())
                 self.assertIn("non-cascaded", self.context['attrs']['class'].split())
 
+    def test_merge_classes_preserves_order(self):
+        tag = MockTag(self.context, self.form)
+        self.assertEqual({"class": "b a c d", "id": "id"},
+                         tag.merge_attrs({"class": " b  a "}, {"class": None, "id": "id"}, {"class": "a c b d"}))
+
     def test_empty_prefixes(self):
         tag = MockTag(self.context, self.form)
         self.assertDictEqual({"attrs": {'attr': 'attr'}}, tag.build_attrs({'attr': 'attr'}))
 
+    def test_prefixed_attributes(self):
+        tag = MockTag(self.context, self.form)
+        self.assertDictEqual({"attrs": {"class": "a"}, "label_attrs": {"class": "b"}, "help_text_attrs": {"id": "c"}},
+                             tag.build_attrs({"class": "a", "label_class": "b", "help_text_id": "c"}, "label", "help_text"))
+
+    def test_scope_is_flattened(self):
+        self.context.update({"outer": "outer"})
+        dicts = self.context.dicts
+        with MockTag(self.context, self.form, theme="theme2") as context:
+            self.assertEqual(1, len(context.dicts))
+            self.assertEqual("outer", context["outer"])
+            self.assertIs(self.form, context["myform"])
+            self.assertIs(self.form, context["obj"])
+            self.assertEqual("theme2", context["silhouette_theme"])
+        self.assertIs(dicts, self.context.dicts)
+        self.assertNotIn("obj", self.context)
+
+    @override_settings(TEMPLATE_CONTEXT_PROCESSORS=['django.template.context_processors.csrf'])
+    def test_scope_keeps_request_context_processors_frame(self):
+        context = RequestContext(HttpRequest(), {"outer": "outer"})
+        with MockTag(context, self.form) as scope:
+            outer, token = Template("{{ outer }} {{ csrf_token }}").render(scope).split(" ")
+        self.assertEqual("outer", outer)
+        self.assertTrue(token)
+        self.assertNotIn("obj", context)
+
+    def test_scope_is_restored_on_error(self):
+        dicts = self.context.dicts
+        with self.assertRaises(ValueError):
+            with MockTag(self.context, self.form):
+                raise ValueError()
+        self.assertIs(dicts, self.context.dicts)
+
     def test_tag(self):
         template_source = """{% load silhouette_tags %}{% mock myform class="form-class" %}"""
         template_target = """silhouette/theme/mock_form"""
         self.assertEqual(template_target, get_template_from_string(template_source).render(self.context).strip())
 
+    def test_tag_requires_object(self):
+        with self.assertRaises(TemplateSyntaxError):
+            get_template_from_string("""{% load silhouette_tags %}{% mock %}""")
+
+    def test_tag_as_variable(self):
+        template_source = """{% load silhouette_tags %}{% mock myform class="form-class" as output %}[{{ output|safe }}]"""
+        self.assertEqual("[silhouette/theme/mock_form]", get_template_from_string(template_source).render(self.context).strip())
+
+    def test_tag_as_variable_requires_object(self):
+        with self.assertRaises(TemplateSyntaxError):
+            get_template_from_string("""{% load silhouette_tags %}{% mock as output %}""")
+
+    def test_tag_only_accepts_keyword_arguments(self):
+        with self.assertRaises(TemplateSyntaxError):
+            get_template_from_string("""{% load silhouette_tags %}{% mock myform "positional" %}""")
+
+
+@override_settings(SILHOUETTE_PATH="test_tags/fields")
+class TestTagCompilation(SimpleTestCase):
+
+    def setUp(self):
+        self.form = MockForm()
+        self.context = Context({"form": self.form, "widget_class": "variable"})
+
+    def tearDown(self):
+        self.form = None
+        self.context = None
+
+    def get_node(self, template_source):
+        template = get_template_from_string(template_source)
+        return getattr(template, 'template', template).nodelist.get_nodes_by_type(SilhouetteNode)[0]
+
+    def test_literal_kwargs_are_compiled(self):
+        node = self.get_node("""{% load silhouette_tags %}{% field form.text_input class="a a" widget_class="b" theme="theme" %}""")
+        self.assertEqual({}, node.variables)
+        self.assertEqual({"attrs": {"class": "a"}, "widget_attrs": {"class": "b"}}, node.compiled_attrs)
+
+    def test_variable_kwargs_are_compiled_when_rendering(self):
+        template_source = """{% load silhouette_tags %}{% field_widget form.text_input class=widget_class id="widget-id" %}"""
+        self.assertIsNone(self.get_node(template_source).compiled_attrs)
+        template_target = """<input class="variable" id="widget-id" name="text_input" type="text" />"""
+        self.assertEqual(template_target, get_template_from_string(template_source).render(self.context).strip())
+
+    def test_variable_options_dont_prevent_compilation(self):
+        template_source = """{% load silhouette_tags %}{% field_widget form.text_input class="literal" theme=theme %}"""
+        self.assertEqual({"attrs": {"class": "literal"}}, self.get_node(template_source).compiled_attrs)
+        template_target = """<input class="literal" id="id_text_input" name="text_input" type="text" />"""
+        self.assertEqual(template_target, get_template_from_string(template_source).render(self.context).strip())
+
+    def test_filtered_kwargs_are_variables(self):
+        template_source = """{% load silhouette_tags %}{% field_widget form.text_input class="literal"|upper %}"""
+        self.assertIn("class", self.get_node(template_source).variables)
+        template_target = """<input class="LITERAL" id="id_text_input" name="text_input" type="text" />"""
+        self.assertEqual(template_target, get_template_from_string(template_source).render(self.context).strip())
+
 
 @override_settings(SILHOUETTE_PATH="test_tags/forms")
 class TestFormTags(SimpleTestCase):
@@ -115,7 +215,6 @@ class TestFormTags(SimpleTestCase):
     def tearDown(self):
         self.form = None
         self.context = None
-        clear_app_settings_cache()
 
     def test_form(self):
         template_source = """{% load silhouette_tags %}{% silhouette form action="/" %}"""
@@ -179,7 +278,6 @@ class TestFormsetTags(SimpleTestCase):
         self.form = None
         self.formset = None
         self.context = None
-        clear_app_settings_cache()
 
     def test_formset(self):
         template_source = """{% load silhouette_tags %}{% formset formset %}"""
@@ -205,7 +303,6 @@ class TestFieldTags(SimpleTestCase):
     def tearDown(self):
         self.form = None
         self.context = None
-        clear_app_settings_cache()
 
     def test_field(self):
         template_source = """{% load silhouette_tags %}{% field form.url_input widget_class="url-widget" label_class="url-label" label_contents="I need a url" help_text_contents="Url should look like http://example.org" widget_id="widget-id" %}"""
@@ -241,3 +338,130 @@ class TestFieldTags(SimpleTestCase):
         template_source = """{% load silhouette_tags %}{% field_errors form.email_input template="does/not/exist.html" %}"""
         template_target = """<ul class="errorlist"><li>This field is required.</li></ul>"""
         self.assertEqual(template_target, get_template_from_string(template_source).render(self.context).strip())
+
+    def test_field_does_not_mutate_widget(self):
+        widget = self.form.fields['url_input'].widget
+        widget.attrs = {"class": "original"}
+        tag = Field(self.context, self.form['url_input'], widget_class="scoped")
+        with tag as context:
+            self.assertEqual({"class": "original"}, widget.attrs)
+            self.assertEqual({"class": "original scoped"}, context['field'].field.widget.attrs)
+            self.assertIsNot(widget, context['field'].field.widget)
+        self.assertEqual({"class": "original"}, widget.attrs)
+
+    def test_widget_kind_in_context(self):
+        with Field(self.context, self.form['url_input']) as context:
+            self.assertEqual('url_input', context['widget_kind'])
+
+    def test_field_is_not_copied_without_widget_attrs(self):
+        bound_field = self.form['url_input']
+        with Field(self.context, bound_field, label_class="label") as context:
+            self.assertIs(bound_field, context['field'])
+
+
+@override_settings(SILHOUETTE_PATH="test_tags/fragments")
+class TestFragmentCache(SimpleTestCase):
+
+    template_source = """{% load silhouette_tags %}{% silhouette form cache=True action="/" %}"""
+
+    def setUp(self):
+        self.cache = caches['default']
+        self.cache.clear()
+
+    def tearDown(self):
+        self.cache.clear()
+
+    def render(self, form, **context):
+        context['form'] = form
+        return get_template_from_string(self.template_source).render(Context(context))
+
+    def test_unbound_form_is_cached(self):
+        output = self.render(MockForm2())
+        self.assertIn('action="/"', output)
+        self.assertEqual(1, len(self.cache._cache))
+        self.cache.set(list(self.cache._cache)[0].split(":")[-1], "cached")
+        self.assertEqual("cached", self.render(MockForm2()))
+
+    def test_cache_is_opt_in(self):
+        get_template_from_string("""{% load silhouette_tags %}{% silhouette form %}""").render(Context({"form": MockForm2()}))
+        self.assertEqual(0, len(self.cache._cache))
+
+    def test_bound_form_bypasses_cache(self):
+        self.render(MockForm2(data={"field1": "value"}))
+        self.assertEqual(0, len(self.cache._cache))
+
+    def test_key_depends_on_form_state(self):
+        self.render(MockForm2())
+        self.render(MockForm2(prefix="other"))
+        self.render(MockForm2(initial={"field1": "initial"}))
+        self.assertEqual(3, len(self.cache._cache))
+
+    def test_key_depends_on_field_choices(self):
+        alice, bob = MockForm2(), MockForm2()
+        alice.fields['choice'] = ChoiceField(choices=(("alice", "Alice's"),))
+        bob.fields['choice'] = ChoiceField(choices=(("bob", "Bob's"),))
+        self.assertIn("alice", self.render(alice))
+        self.assertIn("bob", self.render(bob))
+        self.assertNotIn("alice", self.render(bob))
+
+    def test_key_depends_on_widget_attrs(self):
+        form = MockForm2()
+        self.render(form)
+        form.fields['field1'].widget.attrs['placeholder'] = "Value"
+        self.assertIn('placeholder="Value"', self.render(form))
+
+    def test_key_depends_on_cascaded_attrs(self):
+        bound_field = MockForm2()['field1']
+        keys = [get_fragment_key(FieldLabel(Context({"label_attrs": {"class": css}}), bound_field), None, False)
+                for css in ("a", "b")]
+        self.assertNotEqual(keys[0], keys[1])
+
+    def test_key_depends_on_language(self):
+        form = MockForm2()
+        form.fields['field1'].label = ugettext_lazy("Yes")
+        with translation.override("en"):
+            self.assertIn("Yes", self.render(form))
+        with translation.override("de"):
+            self.assertIn("Ja", self.render(form))
+        self.assertEqual(2, len(self.cache._cache))
+
+    @override_settings(USE_TZ=True)
+    def test_key_depends_on_time_zone(self):
+        keys = []
+        for offset in (0, 60):
+            with timezone.override(timezone.get_fixed_timezone(offset)):
+                keys.append(get_fragment_key(FieldLabel(Context(), MockForm2()['field1']), None, False))
+        self.assertNotEqual(keys[0], keys[1])
+
+    def test_lazy_label_key_is_stable(self):
+        keys = []
+        for i in range(2):
+            form = MockForm2()
+            form.fields['field1'].label = ugettext_lazy("Yes")
+            keys.append(get_fragment_key(FieldLabel(Context(), form['field1']), None, False))
+        self.assertEqual(keys[0], keys[1])
+
+    def test_csrf_token_is_substituted(self):
+        output1 = self.render(MockForm2(), csrf_token="token1")
+        output2 = self.render(MockForm2(), csrf_token="token2")
+        self.assertEqual(1, len(self.cache._cache))
+        self.assertIn("value='token1'", output1)
+        self.assertIn("value='token2'", output2)
+        self.assertEqual(output1.replace("token1", "token2"), output2)
+        self.assertNotIn(CSRF_PLACEHOLDER, output2)
+
+    def test_field_is_cached(self):
+        template_source = """{% load silhouette_tags %}{% field form.field1 cache=True %}"""
+        context = Context({"form": MockForm2()})
+        output = get_template_from_string(template_source).render(context)
+        self.assertIn('name="field1"', output)
+        self.assertEqual(1, len(self.cache._cache))
+        self.assertEqual(output, get_template_from_string(template_source).render(context))
+
+    def test_formset_is_cached(self):
+        template_source = """{% load silhouette_tags %}{% formset formset cache=True %}"""
+        context = Context({"formset": MockFormSet()})
+        output = get_template_from_string(template_source).render(context)
+        self.assertIn('name="form-0-field1"', output)
+        self.assertEqual(1, len(self.cache._cache))
+        self.assertEqual(output, get_template_from_string(template_source).render(context))
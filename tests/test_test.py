@@ -0,0 +1,54 @@
+from __future__ import unicode_literals
+
+from django.test import SimpleTestCase
+from django.template.context import Context
+try:
+    from django.template.loader import get_template_from_string
+except ImportError:
+    from django.template import engines
+    get_template_from_string = engines['django'].from_string
+
+
+from .mock.forms import MockForm2
+
+from silhouette import instrumentation
+from silhouette.test import SilhouetteBudget, SilhouetteTestMixin
+
+
+class TestSilhouetteBudget(SilhouetteTestMixin, SimpleTestCase):
+
+    def render(self, template_source, **context):
+        return get_template_from_string("{% load silhouette_tags %}" + template_source).render(Context(context))
+
+    def test_within_budget(self):
+        with self.assertSilhouetteBudget(max_renders=1, max_lookups=1, max_fallbacks=1) as budget:
+            self.render("{% field_widget form.field1 %}", form=MockForm2())
+        self.assertEqual((1, 1, 1), (budget.renders, budget.lookups, budget.fallbacks))
+        self.assertEqual((), instrumentation.listeners)
+
+    def test_counts_inner_tags(self):
+        with self.assertSilhouetteBudget() as budget:
+            self.render("{% silhouette form %}", form=MockForm2())
+        self.assertEqual(1, budget.tags['silhouette'].renders)
+        self.assertEqual(1, budget.tags['field'].renders)
+        self.assertEqual(budget.renders, budget.lookups)
+
+    def test_exceeded_budget_reports_breakdown(self):
+        with self.assertRaises(AssertionError) as raised:
+            with self.assertSilhouetteBudget(max_renders=1, max_fallbacks=0):
+                self.render("{% field_widget form.field1 %}{% field_widget form.field1 %}", form=MockForm2())
+        message = "{}".format(raised.exception)
+        self.assertIn("2 renders (max 1), 2 fallbacks (max 0)", message)
+        self.assertIn("field_widget", message.splitlines()[-1])
+        self.assertEqual((), instrumentation.listeners)
+
+    def test_without_test_case(self):
+        with self.assertRaises(AssertionError):
+            with SilhouetteBudget(max_lookups=0):
+                self.render("{% field form.field1 %}", form=MockForm2())
+
+    def test_errors_are_not_masked(self):
+        with self.assertRaises(ValueError):
+            with self.assertSilhouetteBudget(max_renders=0):
+                self.render("{% field form.field1 %}", form=MockForm2())
+                raise ValueError()
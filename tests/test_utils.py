@@ -7,3 +7,59 @@ class TestUtils(unittest.TestCase):
 
     def test_normalize(self):
         self.assertEqual(utils.normalize('MyNameToNormalize'), 'my_name_to_normalize')
+
+    def test_lru_cache_evicts_least_recently_used(self):
+        cache = utils.LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(1, cache.get('a'))
+        cache.set('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_lru_cache_disabled(self):
+        cache = utils.LRUCache(0)
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(0, len(cache))
+
+    def test_lru_cache_unbounded(self):
+        cache = utils.LRUCache(None)
+        for i in range(2000):
+            cache.set(i, i)
+        self.assertEqual(2000, len(cache))
+        self.assertEqual(0, cache.get(0))
+
+    def test_registry_computes_values_once(self):
+        calls = []
+
+        class Key(object):
+            pass
+
+        def factory(key):
+            calls.append(key)
+            return object()
+
+        registry = utils.Registry(factory)
+        key = Key()
+        self.assertIs(registry[key], registry[key])
+        self.assertEqual([key], calls)
+
+    def test_registry_holds_keys_weakly(self):
+        class Key(object):
+            pass
+
+        registry = utils.Registry(lambda key: key.__name__)
+        self.assertEqual('Key', registry[Key])
+        self.assertEqual(1, len(registry))
+        del Key
+        import gc
+        gc.collect()
+        self.assertEqual(0, len(registry))
+
+    def test_prefix_matcher_is_compiled_once(self):
+        matcher = utils.prefix_matcher(('label', 'help_text'))
+        self.assertIs(matcher, utils.prefix_matcher(('label', 'help_text')))
+        self.assertEqual('help_text', matcher('help_text_class').group(1))
+        self.assertIsNone(matcher('class'))
@@ -0,0 +1,71 @@
+from __future__ import unicode_literals
+
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from django.template.context import Context
+from django.template.loader import get_template
+try:
+    from django.template.loader import get_template_from_string
+except ImportError:
+    from django.template import engines
+    get_template_from_string = engines['django'].from_string
+
+from silhouette.whitespace import strip_text
+
+
+WHITESPACE_TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "OPTIONS": {"loaders": [("silhouette.whitespace.Loader", ["django.template.loaders.app_directories.Loader"])]},
+    },
+]
+
+
+class TestStripText(SimpleTestCase):
+
+    def test_between_tags(self):
+        self.assertEqual("<ul><li>a</li><li>b</li></ul>", strip_text("<ul>\n    <li>a</li> <li>b</li>\n</ul>"))
+
+    def test_line_breaks_around_template_tags(self):
+        self.assertEqual("", strip_text("\n    "))
+        self.assertEqual("<p>", strip_text("\n    <p>\n    "))
+        self.assertEqual("</p>", strip_text("\n</p>\n"))
+
+    def test_text_is_kept(self):
+        self.assertEqual(" ", strip_text(" "))
+        self.assertEqual("\n    Submit\n", strip_text("\n    Submit\n"))
+        self.assertEqual("<b>a</b> b <i>", strip_text("<b>a</b> b <i>"))
+
+
+class TestStripWhitespaceTag(SimpleTestCase):
+
+    def render(self, template_source, **context):
+        return get_template_from_string("{% load silhouette_tags %}" + template_source).render(Context(context))
+
+    def test_text_is_stripped(self):
+        self.assertEqual("<ul><li>a</li><li>b</li></ul>", self.render("""{% stripwhitespace %}
+            <ul>
+                {% for item in items %}
+                    <li>{{ item }}</li>
+                {% endfor %}
+            </ul>
+        {% endstripwhitespace %}""", items=["a", "b"]))
+
+    def test_output_is_kept(self):
+        self.assertEqual("<p><b>\n</b> <b>\n</b></p>", self.render("""{% stripwhitespace %}
+            <p>{{ html|safe }} {{ html|safe }}</p>
+        {% endstripwhitespace %}""", html="<b>\n</b>"))
+
+
+@override_settings(TEMPLATES=WHITESPACE_TEMPLATES, TEMPLATE_LOADERS=WHITESPACE_TEMPLATES[0]['OPTIONS']['loaders'])
+class TestWhitespaceLoader(SimpleTestCase):
+
+    def test_extended_and_included_templates_are_stripped(self):
+        self.assertEqual("<div><b>child</b><ul><li>included</li></ul></div>",
+                         get_template("test_whitespace/child.html").render({}))
+
+    def test_templates_are_stripped_once(self):
+        templates = [get_template("test_whitespace/parent.html") for i in range(2)]
+        templates = [getattr(template, 'template', template) for template in templates]
+        self.assertIs(templates[0], templates[1])
+        self.assertTrue(templates[0].whitespace_stripped)